@@ -0,0 +1,163 @@
+import threading
+import time
+
+
+class RealClock:
+    """
+        Real-time clock: simulated seconds are wall-clock seconds.
+
+        Every clock offers the same methods, so `Elevator`, `run_simulation`
+        and `RequestIngestor` can take any of them:
+            now() -> float: current simulated time in seconds.
+            sleep(seconds): wait for `seconds` of simulated time.
+            register(thread=None) / unregister(thread=None): declare a thread that
+                sleeps on the clock (only ManualClock's virtual time uses this).
+    """
+    def now(self):
+        return time.monotonic()
+
+    def register(self, thread=None):
+        pass
+
+    def unregister(self, thread=None):
+        pass
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+    def __repr__(self):
+        return "RealClock()"
+
+
+class DilatedClock:
+    """
+        Clock that runs `factor` times faster than wall time.
+
+        `sleep(1)` waits 1 / factor real seconds and `now()` advances by `factor`
+        simulated seconds per real second, so demos and soak tests finish quickly
+        while every recorded duration stays in simulated seconds.
+
+        Example:
+            clock = DilatedClock(100)
+            clock.sleep(2)   # returns after ~0.02s of wall time
+    """
+    def __init__(self, factor):
+        if factor <= 0:
+            raise ValueError("factor must be > 0")
+        self.factor = factor
+        self._origin = time.monotonic()
+
+    def now(self):
+        return (time.monotonic() - self._origin) * self.factor
+
+    def register(self, thread=None):
+        pass
+
+    def unregister(self, thread=None):
+        pass
+
+    def sleep(self, seconds):
+        time.sleep(seconds / self.factor)
+
+    def __repr__(self):
+        return f"DilatedClock({self.factor})"
+
+
+class ManualClock:
+    """
+        Deterministic clock driven by the test.
+
+        With `auto_advance=True` the clock runs in virtual time. Threads that sleep
+        on it (elevators, the rebalancer, the `run_simulation` caller) register
+        first. Time only moves when every registered thread is blocked in `sleep()`.
+        Sleepers are then released one at a time, ordered by wake-up time and then
+        registration order, so the same run always produces the same accounting.
+        A thread that never registered counts as a participant while it sleeps,
+        so single-threaded tests can just call `sleep()`.
+
+        Without `auto_advance`, `sleep()` blocks until another thread calls
+        `advance()` past the sleeper's wake-up time (step mode).
+
+        Example:
+            clock = ManualClock()
+            # elevator thread: clock.sleep(1) blocks...
+            clock.advance(1)   # ...until the test steps time forward
+    """
+    def __init__(self, start=0.0, auto_advance=False):
+        self.auto_advance = auto_advance
+        self._now = start
+        self._condition = threading.Condition()
+        self._participants = {}  # thread -> registration order
+        self._next_order = 0
+        self._sleepers = {}      # thread -> (wake_at, order)
+        self._released = None    # the sleeper allowed to return next
+
+    def now(self):
+        with self._condition:
+            return self._now
+
+    def register(self, thread=None):
+        """
+            Declare a thread that sleeps on this clock. Virtual time waits for it
+            to block before moving. Call it before the thread starts.
+
+            Args:
+                thread (threading.Thread, optional): Defaults to the current thread.
+        """
+        with self._condition:
+            thread = thread if thread is not None else threading.current_thread()
+            if thread not in self._participants:
+                self._participants[thread] = self._next_order
+                self._next_order += 1
+
+    def unregister(self, thread=None):
+        """
+            Remove a thread from virtual time, e.g. before it exits or before it
+            blocks on something other than the clock (such as `join()`).
+
+            Args:
+                thread (threading.Thread, optional): Defaults to the current thread.
+        """
+        with self._condition:
+            self._participants.pop(thread if thread is not None else threading.current_thread(), None)
+            self._schedule()
+
+    def sleep(self, seconds):
+        with self._condition:
+            wake_at = self._now + seconds
+            if not self.auto_advance:
+                while self._now < wake_at:
+                    self._condition.wait()
+                return
+            thread = threading.current_thread()
+            self._sleepers[thread] = (wake_at, self._participants.get(thread, float('inf')))
+            self._schedule()
+            while self._released is not thread:
+                self._condition.wait()
+            self._released = None
+            del self._sleepers[thread]
+
+    def _schedule(self):
+        # Caller holds the condition. Release the next sleeper once nobody registered is running.
+        if self._released is not None or not self._sleepers:
+            return
+        if any(thread not in self._sleepers for thread in self._participants):
+            return
+        thread, (wake_at, _) = min(self._sleepers.items(), key=lambda item: item[1])
+        self._now = max(self._now, wake_at)
+        self._released = thread
+        self._condition.notify_all()
+
+    def advance(self, seconds):
+        """
+            Step simulated time forward and wake every sleeper that is due (step mode).
+
+            Args:
+                seconds (float): Simulated seconds to advance.
+        """
+        with self._condition:
+            self._now += seconds
+            self._condition.notify_all()
+
+    def __repr__(self):
+        return f"ManualClock({self._now})"
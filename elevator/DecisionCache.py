@@ -0,0 +1,134 @@
+import threading
+from collections import OrderedDict
+
+
+class DecisionCache:
+    """
+        Bounded LRU cache of dispatch decisions.
+
+        A decision is keyed on the request (start, destination, direction), the
+        weights in use and a compact fingerprint of the fleet: per elevator its
+        quantized floor, status, queue length and the quantized destination of its
+        first queued request (the fields `find_best_elevator` scores on). When any
+        car's fingerprint changes, the key changes, so a stale decision is never
+        returned; old keys simply age out of the LRU.
+
+        Queue length enters the score only as a per-car penalty, so the choice
+        depends on how loads differ, not on their absolute size. The fingerprint
+        therefore keeps each car's load relative to the least loaded car. Every
+        assignment still changes the key, but a balanced fleet keeps coming back
+        to the same relative loads, so a steady stream of similar calls hits.
+
+        Attributes:
+            max_size (int): Maximum number of cached decisions.
+            floor_quantum (int): Floors per position bucket (1 = exact floors).
+            hits (int): Lookups answered from the cache.
+            misses (int): Lookups that needed a full scoring pass.
+            evictions (int): Entries dropped to respect `max_size`.
+            lock (threading.Lock): Guards the cache across dispatcher threads.
+
+        Example:
+            cache = DecisionCache(max_size=1024, floor_quantum=2)
+            find_best_elevator(request, elevators, cache=cache)
+            print(f"{cache.hit_rate:.0%}")
+    """
+    def __init__(self, max_size=1024, floor_quantum=1):
+        """
+            Initialize the DecisionCache object.
+
+            Args:
+                max_size (int, optional): Maximum cached decisions. Defaults to 1024.
+                floor_quantum (int, optional): Floors per position bucket. Defaults to 1.
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be >= 1")
+        if floor_quantum < 1:
+            raise ValueError("floor_quantum must be >= 1")
+        self.max_size = max_size
+        self.floor_quantum = floor_quantum
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+        self._entries = OrderedDict()
+
+
+    def make_key(self, request, fleet, weights):
+        """
+            Build the cache key for a request against a fleet snapshot.
+
+            Args:
+                request (ElevatorRequest): The request being dispatched.
+                fleet (tuple): ElevatorSnapshot objects, in elevator order.
+                weights (dict): Scoring weights.
+
+            Returns:
+                tuple: Hashable key.
+        """
+        quantum = self.floor_quantum
+        min_load = min((len(snapshot.requests) for snapshot in fleet), default=0)
+        fingerprint = tuple(
+            (snapshot.name,
+             snapshot.current_floor // quantum,
+             snapshot.status,
+             len(snapshot.requests) - min_load,
+             snapshot.requests[0].destination_floor // quantum if snapshot.requests else None)
+            for snapshot in fleet
+        )
+        weights_version = tuple(sorted(weights.items()))
+        return request.start_floor, request.destination_floor, request.direction, weights_version, fingerprint
+
+
+    def get(self, key):
+        """
+            Returns:
+                int or None: Cached elevator index for `key`, or None on a miss.
+        """
+        with self.lock:
+            index = self._entries.get(key)
+            if index is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return index
+
+
+    def put(self, key, index):
+        """
+            Cache the chosen elevator index for `key`, evicting the least recently used entry if full.
+        """
+        with self.lock:
+            self._entries[key] = index
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+
+    def invalidate(self):
+        """
+            Drop every cached decision, e.g. after reloading weights from disk.
+        """
+        with self.lock:
+            self._entries.clear()
+
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+    def __len__(self):
+        return len(self._entries)
+
+
+    def print_report(self):
+        """
+            Prints hit/miss counters for the run.
+        """
+        print("\nDECISION CACHE:")
+        print("----------------------")
+        print(f"| Hits: {self.hits} | Misses: {self.misses} | Hit rate: {self.hit_rate:.1%} | "
+              f"Evictions: {self.evictions} | Size: {len(self)}/{self.max_size} |")
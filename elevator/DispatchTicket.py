@@ -0,0 +1,81 @@
+import threading
+
+
+class DispatchTicket:
+    """
+        Acknowledgement for one submitted request.
+
+        Returned at once by `Dispatcher.submit`; resolved by the dispatcher thread
+        once the request's batch has been decided.
+
+        `elevator_name` is the initial assignment. A Rebalancer may later move the
+        queued request to another car; `locate()` tells where it is now.
+
+        Attributes:
+            request (ElevatorRequest): The submitted request.
+            status (str or None): 'assigned', 'shed', 'rejected' or 'error' once resolved.
+            elevator_name (str or None): The elevator the request was first assigned to.
+            error (BaseException or None): What stopped the dispatcher, if status is 'error'.
+
+        Example:
+            ticket = dispatcher.submit(ElevatorRequest(1, 5))
+            if ticket.wait(timeout=1):
+                print(ticket.status, ticket.elevator_name)   # assigned E2
+            print(ticket.locate(get_fleet_snapshot(elevators)))   # E1, after work stealing
+    """
+
+    def __init__(self, request):
+        self.request = request
+        self.status = None
+        self.elevator_name = None
+        self.error = None
+        self._resolved = threading.Event()
+
+    def resolve(self, status, elevator_name=None, error=None):
+        self.status = status
+        self.elevator_name = elevator_name
+        self.error = error
+        self._resolved.set()
+
+    def done(self):
+        return self._resolved.is_set()
+
+    def wait(self, timeout=None):
+        """
+            Block until the ticket is resolved.
+
+            Args:
+                timeout (float, optional): Seconds to wait. Defaults to None (forever).
+
+            Returns:
+                bool: True if resolved, False on timeout.
+        """
+        return self._resolved.wait(timeout)
+
+    def locate(self, fleet):
+        """
+            Find the elevator that holds the request now, on its own or merged into a hall call.
+
+            Args:
+                fleet (tuple): ElevatorSnapshot objects, e.g. from get_fleet_snapshot()
+                               (a consistent cut, so a request being moved is not missed).
+
+            Returns:
+                str or None: Name of the elevator queueing or serving the request,
+                             or None if it is not assigned or already served.
+        """
+        for snapshot in fleet:
+            for request in snapshot.requests + (snapshot.current_request,):
+                if request is self.request or any(rider is self.request for rider in getattr(request, 'riders', ())):
+                    return snapshot.name
+        return None
+
+    def raise_for_error(self):
+        """
+            Re-raise the dispatcher's exception in the calling thread, if the ticket has one.
+        """
+        if self.error is not None:
+            raise self.error
+
+    def __str__(self):
+        return f"Ticket: [{self.request}] {self.status or 'pending'} {self.elevator_name or ''}".rstrip()
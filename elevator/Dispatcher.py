@@ -0,0 +1,177 @@
+import queue
+import threading
+
+from elevator.DispatchTicket import DispatchTicket
+from elevator.RequestIngestor import RequestIngestor
+
+
+class Dispatcher(threading.Thread):
+    """
+        Thread-safe, multi-producer entry point for elevator requests.
+
+        Any number of producer threads (floor panels, replay readers, load
+        generators) call `submit()`, which only puts a ticket on a multi-producer
+        queue and returns. The dispatcher thread drains the queue in micro-batches,
+        runs each batch through the RequestIngestor, takes one fleet snapshot per
+        batch and assigns every resulting stop against it. Only the dispatcher
+        thread calls `select_elevator`, so no lock is needed around it.
+
+        Each batch drains the ingestor once. Requests it deferred wait for a later
+        batch; while any are held back the thread also wakes every `tick` seconds
+        to dispatch them, even when nothing new is submitted.
+
+        Attributes:
+            elevators (list): The fleet requests are assigned to.
+            select_elevator (callable): (request, elevators, fleet) -> Elevator.
+            ingestor (RequestIngestor): Coalescing and admission control.
+            summary (StreamingSummary or None): Records every assignment.
+            profiler (PhaseProfiler or None): Times every dispatch decision.
+            batch_size (int): Maximum tickets taken off the queue per batch.
+            tick (float): Seconds between batches while the ingestor holds requests back.
+            batches (int): Number of batches dispatched.
+            error (BaseException or None): The exception that stopped the thread, if any.
+            _stop_signal (threading.Event): Signal to stop once the queue is drained.
+    """
+    def __init__(self, elevators, select_elevator, ingestor=None, summary=None, profiler=None, batch_size=64,
+                 tick=0.1):
+        """
+            Initialize the Dispatcher object.
+
+            Args:
+                elevators (list): List of Elevator objects.
+                select_elevator (callable): Picks the elevator for a request, e.g. find_best_elevator.
+                ingestor (RequestIngestor, optional): Defaults to RequestIngestor().
+                summary (StreamingSummary, optional): Defaults to None.
+                profiler (PhaseProfiler, optional): Defaults to None (disabled).
+                batch_size (int, optional): Maximum batch size. Defaults to 64.
+                tick (float, optional): Seconds between batches for deferred requests. Defaults to 0.1.
+        """
+        super().__init__()
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        self.elevators = elevators
+        self.select_elevator = select_elevator
+        self.ingestor = ingestor if ingestor is not None else RequestIngestor()
+        self.summary = summary
+        self.profiler = profiler
+        self.batch_size = batch_size
+        self.tick = tick
+        self.batches = 0
+        self.error = None
+        self._queue = queue.SimpleQueue()
+        self._waiting = {}  # id(request) -> [DispatchTicket], until the request is assigned
+        self._stop_signal = threading.Event()
+        self._submit_lock = threading.Lock()  # orders every submit() before or after stop()
+
+
+    def submit(self, request):
+        """
+            Submit a request from any thread. Never blocks on the dispatcher.
+
+            Args:
+                request (ElevatorRequest): The request to dispatch.
+
+            Returns:
+                DispatchTicket: Resolved once the request has been assigned, shed or rejected,
+                                or with status 'error' if the dispatcher thread failed.
+        """
+        ticket = DispatchTicket(request)
+        with self._submit_lock:
+            if self._stop_signal.is_set():
+                raise RuntimeError("Dispatcher is stopped")
+            self._queue.put(ticket)
+        return ticket
+
+
+    def stop(self):
+        """
+            Signals the thread to stop after dispatching everything submitted so far.
+        """
+        with self._submit_lock:
+            self._stop_signal.set()
+            self._queue.put(None)  # queued after every accepted ticket, so all of them get dispatched
+
+
+    def run(self):
+        tickets = []
+        try:
+            stopping = False
+            while not stopping or self.ingestor.has_pending():
+                try:
+                    batch = [self._queue.get(timeout=self.tick if self.ingestor.has_pending() else None)]
+                except queue.Empty:
+                    batch = []  # tick: dispatch what the ingestor held back
+                while batch and len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                stopping = stopping or None in batch
+                tickets = [ticket for ticket in batch if ticket is not None]
+                if tickets or self.ingestor.has_pending():
+                    self.dispatch_batch(tickets)
+        except BaseException as error:
+            # Nobody may wait forever on a dispatcher that is gone: fail every outstanding ticket
+            self.error = error
+            with self._submit_lock:
+                self._stop_signal.set()
+            for ticket in tickets + [ticket for waiting in self._waiting.values() for ticket in waiting]:
+                if not ticket.done():
+                    ticket.resolve('error', error=error)
+            self._waiting.clear()
+            self._drain('error', error)
+            raise
+
+        # Nothing can follow the stop sentinel; this is only a safety net
+        self._drain('rejected')
+
+
+    def _drain(self, status, error=None):
+        while True:
+            try:
+                ticket = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if ticket is not None:
+                ticket.resolve(status, error=error)
+
+
+    def dispatch_batch(self, tickets):
+        """
+            Decide one micro-batch against a single fleet snapshot.
+
+            The snapshot entry of each chosen elevator is refreshed after assigning,
+            so later stops in the same batch see the load the batch itself added.
+            A request that joins a stop assigned in an earlier batch is acknowledged
+            at once with that stop's elevator.
+
+            Args:
+                tickets (list): DispatchTicket objects to dispatch.
+        """
+        for ticket in tickets:
+            result = self.ingestor.submit(ticket.request)
+            if result in ('shed', 'rejected'):
+                ticket.resolve(result)
+            elif result == 'joined':
+                elevator = self.ingestor.get_assignment(ticket.request)
+                if self.summary is not None:
+                    self.summary.add_rider(elevator.name, ticket.request)
+                ticket.resolve('assigned', elevator.name)
+            else:
+                self._waiting.setdefault(id(ticket.request), []).append(ticket)
+
+        fleet = [elevator.snapshot() for elevator in self.elevators]
+        for request in self.ingestor.drain():
+            started = self.profiler.start() if self.profiler else None
+            best_elevator = self.select_elevator(request, self.elevators, fleet)
+            if self.profiler:
+                self.profiler.stop(self.profiler.DISPATCHER, 'dispatch', started)
+            if self.summary is not None:
+                self.summary.record(best_elevator.name, request)  # before the rebalancer can move it
+            best_elevator.assign_request(request)
+            self.ingestor.assign(request, best_elevator)
+            fleet[self.elevators.index(best_elevator)] = best_elevator.snapshot()
+            for rider in getattr(request, 'riders', (request,)):
+                for ticket in self._waiting.pop(id(rider), ()):
+                    ticket.resolve('assigned', best_elevator.name)
+        self.batches += 1
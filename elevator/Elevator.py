@@ -1,6 +1,7 @@
 import threading
-import time
 
+from elevator.Clock import RealClock
+from elevator.ElevatorSnapshot import ElevatorSnapshot
 from elevator.ElevatorStatus import ElevatorStatus
 
 
@@ -12,32 +13,135 @@ class Elevator(threading.Thread):
             name (str): The identifier for the elevator.
             current_floor (int): The floor where the elevator currently is.
             status (str): The current state of the elevator (idle, loading, moving, etc.).
-            requests (list): A queue of pickup/drop-off requests.
+            requests (tuple): Read-only view of the queued pickup/drop-off requests.
+                              Change it only through `assign_request`, `join_stop`,
+                              `take_next_request` and `transfer_request`, which always
+                              publish a snapshot.
             stops (int): Total number of stops the elevator has made.
             total_movement (int): Total number of floors moved.
             total_time (int): Total simulated time (in seconds) spent operating.
             lock (threading.Lock): Thread-safe access to shared resources.
             _stop_signal (threading.Event): Signal to gracefully stop the thread.
+            profiler (PhaseProfiler or None): Optional per-phase timing hooks.
+            clock: Time source used for every simulated wait (RealClock, DilatedClock, ManualClock).
+
+        Every change to the state above is published as a new immutable
+        `ElevatorSnapshot` (see `snapshot()`), so other threads can read a
+        consistent view of the elevator without taking `lock`.
     """
-    def __init__(self, name, starting_floor=1):
+    def __init__(self, name, starting_floor=1, profiler=None, clock=None):
         """
             Initialize the Elevator object.
 
             Args:
                 name (str): Name or identifier of the elevator.
                 starting_floor (int, optional): Initial floor. Defaults to 1.
+                profiler (PhaseProfiler, optional): Instrumentation hooks. Defaults to None (disabled).
+                clock (optional): Time source. Defaults to RealClock().
         """
         super().__init__()
         self.name = name
-        self.current_floor = starting_floor
-        self.status = ElevatorStatus.IDLE
-        self.requests = []
-        self.stops = 0
-        self.total_movement = 0
-        self.total_time = 0
+        self._current_floor = starting_floor
+        self._status = ElevatorStatus.IDLE
+        self._requests = ()  # copy-on-write queue, replaced under `lock` on every change
+        self._current_request = None
+        self._stops = 0
+        self._total_movement = 0
+        self._total_time = 0
         self.lock = threading.Lock()
         self.reached_request_floor = False
         self._stop_signal = threading.Event()
+        self._publish_lock = threading.Lock()
+        self._snapshot = ElevatorSnapshot(name, version=0, current_floor=starting_floor)
+        self.profiler = profiler
+        self.clock = clock if clock is not None else RealClock()
+
+
+    def snapshot(self):
+        """
+            Returns the latest published state of this elevator.
+            Lock-free: the snapshot is immutable and replaced as a whole on every change.
+
+            Returns:
+                ElevatorSnapshot: The current snapshot.
+        """
+        return self._snapshot
+
+
+    def _publish(self):
+        """
+            Publishes a new snapshot from the current state (copy-on-write).
+            Only writers serialize on `_publish_lock`; readers never block.
+            The queue is an immutable tuple that is swapped, never mutated, so it can be
+            read here without `lock`.
+        """
+        with self._publish_lock:
+            self._snapshot = ElevatorSnapshot(
+                self.name,
+                version=self._snapshot.version + 1,
+                current_floor=self._current_floor,
+                status=self._status,
+                requests=self._requests,
+                current_request=self._current_request,
+                stops=self._stops,
+                total_movement=self._total_movement,
+                total_time=self._total_time,
+            )
+
+    @property
+    def requests(self):
+        return self._requests
+
+    @requests.setter
+    def requests(self, value):
+        with self.lock:
+            self._requests = tuple(value)
+            self._publish()
+
+    @property
+    def current_floor(self):
+        return self._current_floor
+
+    @current_floor.setter
+    def current_floor(self, value):
+        self._current_floor = value
+        self._publish()
+
+    @property
+    def status(self):
+        return self._status
+
+    @status.setter
+    def status(self, value):
+        self._status = value
+        self._publish()
+
+    @property
+    def stops(self):
+        return self._stops
+
+    @stops.setter
+    def stops(self, value):
+        self._stops = value
+        self._publish()
+
+    @property
+    def total_movement(self):
+        return self._total_movement
+
+    @total_movement.setter
+    def total_movement(self, value):
+        self._total_movement = value
+        self._publish()
+
+    @property
+    def total_time(self):
+        return self._total_time
+
+    @total_time.setter
+    def total_time(self, value):
+        self._total_time = value
+        self._publish()
 
 
     def assign_request(self, request):
@@ -48,10 +152,87 @@ class Elevator(threading.Thread):
                 request: A request object with `start_floor` and `destination_floor`.
         """
         with self.lock:
-            self.requests.append(request)
+            self._requests += (request,)
+            self._publish()
         print(f"<{self.name} assigned : [{request}]>")
 
 
+    def join_stop(self, hall_call, rider):
+        """
+            Add a rider to a hall call that is still queued here (not picked up yet).
+            A single-rider stop is queued as its only rider; it is swapped for the hall call.
+
+            Args:
+                hall_call (HallCall): The stop, as opened by the RequestIngestor.
+                rider (ElevatorRequest): Request with the same start floor and direction.
+
+            Returns:
+                bool: True if the rider joined, False if the stop is no longer queued here.
+        """
+        queued = hall_call if len(hall_call.riders) > 1 else hall_call.riders[0]
+        with self.lock:
+            if not any(request is queued for request in self._requests):
+                return False
+            hall_call.add_rider(rider)
+            self._requests = tuple(hall_call if request is queued else request for request in self._requests)
+            self._publish()
+        print(f"<{self.name} joined : [{rider}] → [{hall_call}]>")
+        return True
+
+
+    def take_next_request(self):
+        """
+            Pop the next queued request (FIFO) and mark it as in progress.
+
+            Returns:
+                The request, or None if the queue is empty.
+        """
+        with self.lock:
+            if not self._requests:
+                return None
+            current_request, self._requests = self._requests[0], self._requests[1:]
+            self._current_request = current_request
+            self._publish()
+        return current_request
+
+
+    def transfer_request(self, request, target):
+        """
+            Move a queued request from this elevator to `target`, if it has not been picked up yet.
+
+            Both locks are taken in a fixed order so concurrent transfers cannot deadlock.
+            The target publishes first, so at every instant the request is published in
+            at least one queue (briefly in both). A reader that takes the cars' snapshots
+            one by one can still miss it: use `get_fleet_snapshot`, which retries until it
+            has a consistent cut of the fleet.
+
+            Args:
+                request: A request currently in this elevator's `requests`.
+                target (Elevator): The elevator that takes over the request.
+
+            Returns:
+                bool: True if the request was moved, False if it was no longer queued here.
+        """
+        first, second = sorted((self, target), key=id)
+        with first.lock, second.lock:
+            if request not in self._requests:
+                return False
+            target._requests += (request,)
+            target._publish()
+            self._requests = tuple(queued for queued in self._requests if queued is not request)
+            self._publish()
+        print(f"<{self.name} → {target.name} reassigned : [{request}]>")
+        return True
+
+
+    def start(self):
+        """
+            Registers the thread with its clock, then starts it.
+        """
+        self.clock.register(self)
+        super().start()
+
+
     def stop(self):
         """
             Signals the thread to stop after the current iteration.
@@ -64,44 +245,75 @@ class Elevator(threading.Thread):
             Main loop of the elevator thread. Processes requests by:
             1. Moving to the pickup floor.
             2. Simulating loading time.
-            3. Moving to the destination floor.
-            4. Simulating unloading time.
+            3. Moving to the destination floor(s).
+            4. Simulating unloading time at each of them.
+
+            When the profiler has cProfile enabled, the whole loop runs under it.
         """
+        try:
+            if self.profiler is not None and self.profiler.cprofile:
+                self.profiler.run_profiled(self.name, self._run_loop)
+            else:
+                self._run_loop()
+        finally:
+            self.clock.unregister(self)
+
+
+    def _run_loop(self):
+        profiler = self.profiler
+        self.clock.sleep(0)  # wait for this thread's first slot on the clock before taking work
         while not self._stop_signal.is_set():
             if self.status != ElevatorStatus.IDLE:
                 print(f"<{self.name} - running elevator: {self.status}>")
-            with self.lock:
-                if not self.requests:
-                    time.sleep(1)
-                    self.total_time += 1
-                    continue
-                # Get next request (FIFO)
-                current_request = self.requests.pop(0)
+            current_request = self.take_next_request()  # Get next request (FIFO)
+            if current_request is None:
+                self.clock.sleep(1)  # idle tick, outside the lock so requests can still be assigned
+                self.total_time += 1
+                continue
 
             # 1. Move to request's start floor (pickup)
+            started = profiler.start() if profiler else None
             if self.current_floor != current_request.start_floor:
                 print(f"--> {self.name} moving to pickup [{current_request}] at floor {current_request.start_floor} | current floor: {self.current_floor}")
                 self.status = ElevatorStatus.MOVING_UP if self.current_floor < current_request.start_floor else ElevatorStatus.MOVING_DOWN
                 self.move_to_floor(current_request.start_floor)
                 self.stops += 1 # adding stop here for condition move to request's start floor (pickup)
 
+            if profiler:
+                profiler.stop(self.name, 'travel_to_pickup', started)
+                started = profiler.start()
+
             # 2. Simulate loading at pickup floor
             print(f"<< {self.name} picked up [{current_request}] at floor {current_request.start_floor} >>")
             self.status = ElevatorStatus.LOADING
-            time.sleep(2)  # Simulate loading
+            self.clock.sleep(2)  # Simulate loading
+            if profiler:
+                profiler.stop(self.name, 'loading', started)
 
-            # 3. Move to destination floor
-            print(f"--> {self.name} moving to drop-off [{current_request}] at floor {current_request.destination_floor} | current floor: {self.current_floor}")
-            self.status = ElevatorStatus.MOVING_UP if self.current_floor < current_request.destination_floor else ElevatorStatus.MOVING_DOWN
-            self.move_to_floor(current_request.destination_floor)
+            # 3./4. Move to each destination floor and unload (a coalesced hall call may have several)
+            destination_floors = current_request.destination_floors
+            for index, destination_floor in enumerate(destination_floors):
+                started = profiler.start() if profiler else None
+                print(f"--> {self.name} moving to drop-off [{current_request}] at floor {destination_floor} | current floor: {self.current_floor}")
+                self.status = ElevatorStatus.MOVING_UP if self.current_floor < destination_floor else ElevatorStatus.MOVING_DOWN
+                self.move_to_floor(destination_floor)
+                if profiler:
+                    profiler.stop(self.name, 'travel_to_destination', started)
+                    started = profiler.start()
 
-            # 4. Unload at destination
-            self.status = ElevatorStatus.UNLOADING
-            print(f"<< {self.name} dropped off [{current_request}] at floor {current_request.destination_floor} >>")
-            time.sleep(2)  # Simulate unloading
+                self.status = ElevatorStatus.UNLOADING
+                print(f"<< {self.name} dropped off [{current_request}] at floor {destination_floor} >>")
+                self.clock.sleep(2)  # Simulate unloading
+                if profiler:
+                    profiler.stop(self.name, 'unloading', started)
+                if index < len(destination_floors) - 1:
+                    self.stops += 1
+                    self.total_time += 2
             self.status = ElevatorStatus.IDLE
             self.stops += 1
             self.total_time += 2
+            self._current_request = None
+            self._publish()
 
 
     def move_to_floor(self, target_destination_floor):
@@ -119,7 +331,7 @@ class Elevator(threading.Thread):
             self.current_floor += step
             total_step += step
             self.total_time += 1  # 1 second per floor
-            time.sleep(1)  # Simulate travel
+            self.clock.sleep(1)  # Simulate travel
             print(f"---> {self.name} moving to floor {self.current_floor}")
 
         self.total_movement += abs(total_step)
@@ -141,9 +353,7 @@ class Elevator(threading.Thread):
             Returns:
                 float: Efficiency score (higher is better).
         """
-        return 1 / ( weight_movement * self.total_movement +
-                     weight_stop * self.stops +
-                     weight_time * self.total_time + 1e-5 ) # avoid division by zero
+        return self._snapshot.get_efficiency_score(weight_movement, weight_stop, weight_time)
 
 
     def __str__(self):
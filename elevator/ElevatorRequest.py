@@ -9,6 +9,7 @@ class ElevatorRequest:
             destination_floor (int): The floor the passenger wants to go to.
             direction (str): Computed property indicating the travel direction
                              ('up', 'down', or 'same floor').
+            destination_floors (tuple): Drop-off floors in travel order (a single floor here).
 
         Example:
             request = ElevatorRequest(3, 7)
@@ -46,5 +47,9 @@ class ElevatorRequest:
         else:
             return 'same floor'
 
+    @property
+    def destination_floors(self):
+        return (self.destination_floor,)
+
     def __str__(self):
         return f"Request: {self.start_floor} → {self.destination_floor} ({self.direction.upper()})"
@@ -0,0 +1,101 @@
+from elevator.ElevatorStatus import ElevatorStatus
+
+
+class ElevatorSnapshot:
+    """
+        An immutable, versioned view of an elevator's state at one moment.
+
+        A running `Elevator` publishes a new snapshot every time its state changes
+        (copy-on-write), so readers such as the dispatcher, monitors and summaries
+        always see one consistent state without taking the elevator's lock.
+
+        Attributes:
+            name (str): The identifier for the elevator.
+            version (int): Monotonically increasing version, bumped on every change.
+            current_floor (int): The floor where the elevator was.
+            status (ElevatorStatus): The state of the elevator.
+            requests (tuple): Pending requests that have not been picked up yet.
+            current_request: The request being served, or None.
+            stops (int): Total number of stops made.
+            total_movement (int): Total number of floors moved.
+            total_time (int): Total simulated time (in seconds) spent operating.
+
+        Example:
+            snapshot = elevator.snapshot()
+            print(snapshot.current_floor)   # 1
+            print(snapshot.is_done)         # True
+    """
+    __slots__ = ('_name', '_version', '_current_floor', '_status', '_requests',
+                 '_current_request', '_stops', '_total_movement', '_total_time')
+
+    def __init__(self, name, version=0, current_floor=1, status=ElevatorStatus.IDLE, requests=(),
+                 current_request=None, stops=0, total_movement=0, total_time=0):
+        self._name = name
+        self._version = version
+        self._current_floor = current_floor
+        self._status = status
+        self._requests = tuple(requests)
+        self._current_request = current_request
+        self._stops = stops
+        self._total_movement = total_movement
+        self._total_time = total_time
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def version(self):
+        return self._version
+
+    @property
+    def current_floor(self):
+        return self._current_floor
+
+    @property
+    def status(self):
+        return self._status
+
+    @property
+    def requests(self):
+        return self._requests
+
+    @property
+    def current_request(self):
+        return self._current_request
+
+    @property
+    def stops(self):
+        return self._stops
+
+    @property
+    def total_movement(self):
+        return self._total_movement
+
+    @property
+    def total_time(self):
+        return self._total_time
+
+    @property
+    def is_idle(self):
+        return self._status == ElevatorStatus.IDLE
+
+    @property
+    def is_done(self):
+        """
+            True when the elevator has no queued request, nothing in progress and is idle.
+        """
+        return not self._requests and self._current_request is None and self.is_idle
+
+    def get_efficiency_score(self, weight_movement=1, weight_stop=2, weight_time=0.5):
+        """
+            Calculates the efficiency score from this snapshot's counters.
+            See `Elevator.get_efficiency_score` for the formula.
+        """
+        return 1 / ( weight_movement * self._total_movement +
+                     weight_stop * self._stops +
+                     weight_time * self._total_time + 1e-5 ) # avoid division by zero
+
+    def __repr__(self):
+        return (f"ElevatorSnapshot({self._name}, v{self._version}, {self._current_floor}, "
+                f"{self._status}, {len(self._requests)})")
@@ -0,0 +1,45 @@
+from elevator.ElevatorRequest import ElevatorRequest
+
+
+class HallCall(ElevatorRequest):
+    """
+        One pickup stop shared by several riders travelling in the same direction.
+
+        Behaves like an `ElevatorRequest` whose destination is the farthest rider
+        destination, so the dispatcher scores it exactly like a single request.
+
+        Attributes:
+            riders (list): The ElevatorRequest objects merged into this stop.
+            opened_at (float): Time the first rider pressed the button.
+            destination_floors (tuple): Distinct drop-off floors in travel order.
+
+        Example:
+            call = HallCall(ElevatorRequest(1, 7), opened_at=0.0)
+            call.add_rider(ElevatorRequest(1, 4))
+            print(call.destination_floors)   # (4, 7)
+    """
+
+    def __init__(self, first_rider, opened_at=0.0):
+        super().__init__(first_rider.start_floor, first_rider.destination_floor)
+        self.riders = [first_rider]
+        self.opened_at = opened_at
+
+    def add_rider(self, request):
+        """
+            Merge another rider into this stop.
+
+            Args:
+                request (ElevatorRequest): Request with the same start floor and direction.
+        """
+        self.riders.append(request)
+        if abs(request.destination_floor - self.start_floor) > abs(self.destination_floor - self.start_floor):
+            self.destination_floor = request.destination_floor
+
+    @property
+    def destination_floors(self):
+        floors = sorted({rider.destination_floor for rider in self.riders})
+        return tuple(floors) if self.direction == 'up' else tuple(reversed(floors))
+
+    def __str__(self):
+        destinations = ", ".join(str(floor) for floor in self.destination_floors)
+        return f"Hall call: {self.start_floor} → [{destinations}] ({self.direction.upper()}, {len(self.riders)} riders)"
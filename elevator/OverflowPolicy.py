@@ -0,0 +1,5 @@
+from enum import Enum
+
+class OverflowPolicy(Enum):
+    SHED = 'shed'
+    DEFER = 'defer'
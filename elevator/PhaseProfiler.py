@@ -0,0 +1,253 @@
+import cProfile
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+
+class PhaseProfiler:
+    """
+        Optional instrumentation for elevator threads and the dispatcher.
+
+        Times each phase of `Elevator.run` (travel to pickup, loading, travel to
+        destination, unloading) and each dispatch call with `perf_counter_ns`,
+        plus per-thread CPU time. Phases are aggregated per car; dispatch calls run
+        on the dispatcher thread and are kept under their own DISPATCHER key.
+        With `cprofile=True` the elevator threads are also profiled, and the
+        results are merged into collapsed-stack output for flamegraph tools.
+
+        Before Python 3.12 each thread runs under its own cProfile.Profile. From
+        3.12 on, cProfile is one tool for the whole interpreter, so only one thread
+        could enable it. Instead, a sampler thread reads every car's stack with
+        `sys._current_frames()` every `sample_interval` seconds and keys it by the
+        thread it came from. A thread that cannot enable cProfile falls back to
+        the sampler as well.
+
+        Elevators and `run_simulation` only call into the profiler when one is
+        given, so leaving it out costs nothing but a `None` check per phase.
+
+        Attributes:
+            cprofile (bool): Whether elevator threads are profiled for collapsed stacks.
+            sampling (bool): Sample stacks instead of running cProfile per thread.
+            sample_interval (float): Seconds between stack samples.
+            lock (threading.Lock): Guards the aggregates across threads.
+    """
+    PHASES = ('travel_to_pickup', 'loading', 'travel_to_destination', 'unloading')
+    DISPATCHER = 'dispatcher'
+
+    def __init__(self, cprofile=False, sampling=None, sample_interval=0.001):
+        """
+            Initialize the PhaseProfiler object.
+
+            Args:
+                cprofile (bool, optional): Profile elevator threads. Defaults to False.
+                sampling (bool, optional): Force (True) or avoid (False) stack sampling.
+                                           Defaults to sampling on Python 3.12+.
+                sample_interval (float, optional): Seconds between samples. Defaults to 0.001.
+        """
+        self.cprofile = cprofile
+        self.sampling = sampling if sampling is not None else sys.version_info >= (3, 12)
+        self.sample_interval = sample_interval
+        self.lock = threading.Lock()
+        self._phases = {}   # (car, phase) -> [count, wall_ns, cpu_ns, max_wall_ns]
+        self._profiles = {} # car -> pstats.Stats
+        self._sampled_threads = {}  # thread ident -> car
+        self._samples = Counter()   # "car;frame;..." -> number of samples
+        self._sampler = None
+
+
+    @staticmethod
+    def start():
+        """
+            Returns:
+                tuple: (wall_ns, cpu_ns) marker to pass to `stop()`.
+        """
+        return time.perf_counter_ns(), time.thread_time_ns()
+
+
+    def stop(self, car, phase, started):
+        """
+            Record the time spent since `started` under (car, phase).
+
+            Args:
+                car (str): Elevator name, or DISPATCHER for dispatch calls.
+                phase (str): Phase name, one of PHASES, or 'dispatch'.
+                started (tuple): Marker returned by `start()`.
+        """
+        wall_ns = time.perf_counter_ns() - started[0]
+        cpu_ns = time.thread_time_ns() - started[1]
+        with self.lock:
+            entry = self._phases.setdefault((car, phase), [0, 0, 0, 0])
+            entry[0] += 1
+            entry[1] += wall_ns
+            entry[2] += cpu_ns
+            entry[3] = max(entry[3], wall_ns)
+
+
+    def get_phase_stats(self):
+        """
+            Returns:
+                dict: {car: {phase: {'count', 'wall_ns', 'cpu_ns', 'max_wall_ns'}}}
+        """
+        with self.lock:
+            stats = {}
+            for (car, phase), (count, wall_ns, cpu_ns, max_wall_ns) in self._phases.items():
+                stats.setdefault(car, {})[phase] = {
+                    'count': count, 'wall_ns': wall_ns, 'cpu_ns': cpu_ns, 'max_wall_ns': max_wall_ns
+                }
+            return stats
+
+
+    def run_profiled(self, car, func):
+        """
+            Run `func` in the current thread under cProfile (or the stack sampler) and keep its stats.
+
+            Args:
+                car (str): Elevator name the stats belong to.
+                func (callable): Thread body to run.
+        """
+        if self.sampling:
+            self._run_sampled(car, func)
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:  # another profiling tool already owns this interpreter
+            self._run_sampled(car, func)
+            return
+        try:
+            func()
+        finally:
+            profile.disable()
+            with self.lock:
+                self._profiles[car] = pstats.Stats(profile)
+
+
+    def _run_sampled(self, car, func):
+        ident = threading.get_ident()
+        with self.lock:
+            self._sampled_threads[ident] = car
+            if self._sampler is None:
+                self._sampler = threading.Thread(target=self._sample_loop, name="PhaseProfiler-sampler", daemon=True)
+                self._sampler.start()
+        try:
+            func()
+        finally:
+            with self.lock:
+                del self._sampled_threads[ident]
+
+
+    def _sample_loop(self):
+        while True:
+            with self.lock:
+                if not self._sampled_threads:
+                    self._sampler = None  # the next sampled thread starts a new sampler
+                    return
+                threads = dict(self._sampled_threads)
+            frames = sys._current_frames()
+            samples = Counter()
+            for ident, car in threads.items():
+                frame = frames.get(ident)
+                path = []
+                while frame is not None:
+                    code = frame.f_code
+                    path.append(self._frame_name((code.co_filename, code.co_firstlineno, code.co_name)))
+                    frame = frame.f_back
+                if path:
+                    samples[";".join([car] + path[::-1])] += 1
+            with self.lock:
+                self._samples.update(samples)
+            time.sleep(self.sample_interval)
+
+
+    def get_collapsed_stacks(self):
+        """
+            Merge every thread's cProfile stats and stack samples into collapsed stacks.
+
+            cProfile only records caller/callee edges, so stacks are rebuilt by
+            walking the call graph from its roots and splitting each function's
+            time across its callers in proportion to the edge's cumulative time.
+            Each stack sample counts as `sample_interval` of wall time.
+
+            Returns:
+                Counter: {"car;module:func;...": microseconds}
+        """
+        stacks = Counter()
+        with self.lock:
+            profiles = list(self._profiles.items())
+            for stack, count in self._samples.items():
+                stacks[stack] += int(count * self.sample_interval * 1e6)
+        for car, profile in profiles:
+            stats = profile.stats
+            callees = {}
+            for func, (_, _, _, _, callers) in stats.items():
+                for caller, edge in callers.items():
+                    callees.setdefault(caller, []).append((func, edge[3]))
+            roots = [func for func, entry in stats.items() if not entry[4]]
+            for root in roots:
+                self._collapse(stats, callees, root, stats[root][3], [car], set(), stacks)
+        return stacks
+
+
+    @classmethod
+    def _collapse(cls, stats, callees, func, budget, path, on_path, stacks, max_depth=64):
+        _, _, total_self, total_cumulative, _ = stats[func]
+        share = budget / total_cumulative if total_cumulative else 0
+        path = path + [cls._frame_name(func)]
+        self_us = int(total_self * share * 1e6)
+        if self_us:
+            stacks[";".join(path)] += self_us
+        if func in on_path or len(path) >= max_depth:
+            return
+        on_path = on_path | {func}
+        for callee, edge_cumulative in callees.get(func, ()):
+            if callee in stats:
+                cls._collapse(stats, callees, callee, edge_cumulative * share, path, on_path, stacks, max_depth)
+
+
+    @staticmethod
+    def _frame_name(func):
+        filename, line, name = func
+        if filename == '~':
+            return name  # built-in
+        return f"{filename.rsplit('/', 1)[-1]}:{name}:{line}"
+
+
+    def write_collapsed(self, filepath):
+        """
+            Write merged collapsed-stack output (one "stack count" per line),
+            ready for flamegraph.pl or speedscope.
+
+            Args:
+                filepath (str): Output file path.
+        """
+        with open(filepath, 'w') as file:
+            for stack, count in sorted(self.get_collapsed_stacks().items()):
+                file.write(f"{stack} {count}\n")
+
+
+    def print_report(self):
+        """
+            Prints wall and CPU time per phase for every car, then the dispatcher's time.
+        """
+        print("\nPHASE PROFILE:")
+        print("----------------------")
+        stats = self.get_phase_stats()
+        dispatcher = stats.pop(self.DISPATCHER, {})
+        for car, phases in sorted(stats.items()):
+            print(f"{car} :")
+            for phase in self.PHASES:
+                if phase in phases:
+                    self._print_entry(phase, phases[phase])
+        if dispatcher:
+            print(f"{self.DISPATCHER} :")
+            for phase, entry in sorted(dispatcher.items()):
+                self._print_entry(phase, entry)
+
+
+    @staticmethod
+    def _print_entry(phase, entry):
+        print(f"| {phase}: {entry['count']} calls | "
+              f"wall {entry['wall_ns'] / 1e6:.3f}ms (max {entry['max_wall_ns'] / 1e6:.3f}ms) | "
+              f"cpu {entry['cpu_ns'] / 1e6:.3f}ms |")
@@ -0,0 +1,157 @@
+import threading
+from collections import deque
+
+from elevator.Clock import RealClock
+
+
+class Rebalancer(threading.Thread):
+    """
+        Background work stealing between elevators.
+
+        Every `interval` simulated seconds it reads a fleet snapshot, estimates when
+        each queued (not yet picked up) request would be reached by its current car,
+        and moves it to another car that would reach it at least `min_gain` seconds
+        sooner. Moves go through `Elevator.transfer_request`, which re-checks the
+        request under both cars' locks.
+
+        Time estimates follow the simulation's own accounting: 1 second per floor,
+        2 seconds to load and 2 seconds to unload at each destination.
+
+        Attributes:
+            elevators (list): The fleet being balanced.
+            interval (float): Simulated seconds between passes.
+            min_gain (float): Minimum pickup-time improvement, in seconds, to move a request.
+            max_moves (int): Upper bound on moves per pass.
+            summary (StreamingSummary or None): Told about every move as it happens.
+            moved (int): Total number of requests moved.
+            moves (deque): The most recent (request, from_name, to_name) moves, bounded
+                           by `recent_moves` so memory does not grow with run length.
+            _stop_signal (threading.Event): Signal to gracefully stop the thread.
+    """
+    LOAD_TIME = 2
+    UNLOAD_TIME = 2
+
+    def __init__(self, elevators, interval=1, min_gain=3, max_moves=10, clock=None, summary=None,
+                 recent_moves=100):
+        """
+            Initialize the Rebalancer object.
+
+            Args:
+                elevators (list): List of Elevator objects.
+                interval (float, optional): Seconds between passes. Defaults to 1.
+                min_gain (float, optional): Seconds a move must save. Defaults to 3.
+                max_moves (int, optional): Moves allowed per pass. Defaults to 10.
+                clock (optional): Time source. Defaults to RealClock().
+                summary (StreamingSummary, optional): Receives `move()` for every transfer.
+                recent_moves (int, optional): How many recent moves to keep. Defaults to 100.
+        """
+        super().__init__()
+        self.elevators = elevators
+        self.interval = interval
+        self.min_gain = min_gain
+        self.max_moves = max_moves
+        self.clock = clock if clock is not None else RealClock()
+        self.summary = summary
+        self.moved = 0
+        self.moves = deque(maxlen=recent_moves)
+        self._stop_signal = threading.Event()
+
+
+    def start(self):
+        """
+            Registers the thread with its clock, then starts it.
+        """
+        self.clock.register(self)
+        super().start()
+
+
+    def stop(self):
+        """
+            Signals the thread to stop after the current pass.
+        """
+        self._stop_signal.set()
+
+
+    def run(self):
+        try:
+            self.clock.sleep(0)  # wait for this thread's first slot on the clock
+            while not self._stop_signal.is_set():
+                self.rebalance_once()
+                self.clock.sleep(self.interval)
+        finally:
+            self.clock.unregister(self)
+
+
+    @classmethod
+    def estimate_queue(cls, snapshot):
+        """
+            Estimate pickup times for every queued request of one elevator.
+
+            Args:
+                snapshot (ElevatorSnapshot): The elevator's state.
+
+            Returns:
+                tuple: (list of (request, pickup_eta), completion_eta, final_floor)
+        """
+        eta = 0
+        floor = snapshot.current_floor
+        if snapshot.current_request is not None:
+            for destination_floor in snapshot.current_request.destination_floors:
+                eta += abs(floor - destination_floor) + cls.UNLOAD_TIME
+                floor = destination_floor
+
+        pickups = []
+        for request in snapshot.requests:
+            eta += abs(floor - request.start_floor)
+            pickups.append((request, eta))
+            eta += cls.LOAD_TIME
+            floor = request.start_floor
+            for destination_floor in request.destination_floors:
+                eta += abs(floor - destination_floor) + cls.UNLOAD_TIME
+                floor = destination_floor
+        return pickups, eta, floor
+
+
+    def find_best_move(self):
+        """
+            Find the single queued request whose move saves the most pickup time.
+
+            The receiver is assumed to serve the request after everything it already has queued.
+
+            Returns:
+                tuple or None: (request, donor, receiver, gain_seconds) or None.
+        """
+        estimates = [(elevator, self.estimate_queue(elevator.snapshot())) for elevator in self.elevators]
+        best_move = None
+        for donor, (pickups, _, _) in estimates:
+            for request, donor_eta in pickups:
+                for receiver, (_, receiver_completion, receiver_floor) in estimates:
+                    if receiver is donor:
+                        continue
+                    receiver_eta = receiver_completion + abs(receiver_floor - request.start_floor)
+                    gain = donor_eta - receiver_eta
+                    if gain >= self.min_gain and (best_move is None or gain > best_move[3]):
+                        best_move = (request, donor, receiver, gain)
+        return best_move
+
+
+    def rebalance_once(self):
+        """
+            Run one rebalancing pass.
+
+            Returns:
+                int: Number of requests moved.
+        """
+        moved = 0
+        for _ in range(self.max_moves):
+            best_move = self.find_best_move()
+            if best_move is None:
+                break
+            request, donor, receiver, _ = best_move
+            if donor.transfer_request(request, receiver):  # False if picked up in the meantime
+                if self.summary is not None:
+                    self.summary.move(request, donor.name, receiver.name)
+                self.moves.append((request, donor.name, receiver.name))
+                self.moved += 1
+                moved += 1
+        return moved
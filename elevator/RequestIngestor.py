@@ -0,0 +1,179 @@
+from collections import deque
+
+from elevator.Clock import RealClock
+from elevator.HallCall import HallCall
+from elevator.OverflowPolicy import OverflowPolicy
+
+
+class RequestIngestor:
+    """
+        Ingestion stage in front of the dispatcher.
+
+        Merges duplicate hall calls (same floor, same direction, within `window`
+        seconds) into one stop with several riders, and bounds the number of
+        distinct stops handed out per `drain()`. When the bound is hit, new stops
+        are either shed or deferred to a later drain, depending on `overflow_policy`.
+
+        A stop stays open for the whole window, not just until it is drained: once
+        the caller reports where it went (`assign()`), later calls still join it
+        for as long as the elevator has not picked it up.
+
+        Attributes:
+            window (float): Seconds during which a new call may join an open stop.
+            max_pending (int or None): Maximum distinct stops per drain (None = unbounded).
+            max_deferred (int or None): Maximum requests held back for later drains.
+            overflow_policy (OverflowPolicy): What to do with new stops when full.
+            submitted (int): Requests offered to the ingestor.
+            merged (int): Requests merged into an existing stop (pending or assigned).
+            deferred (int): Requests held back because the queue was full.
+            shed (int): Requests dropped because the queue (or the deferred backlog) was full.
+            dispatched (int): Stops handed out by `drain()`.
+    """
+    def __init__(self, window=5.0, max_pending=None, overflow_policy=OverflowPolicy.DEFER, clock=None,
+                 max_deferred=None):
+        """
+            Initialize the RequestIngestor object.
+
+            Args:
+                window (float, optional): Coalescing window in seconds. Defaults to 5.0.
+                max_pending (int, optional): Bound on distinct stops per drain. Defaults to None.
+                overflow_policy (OverflowPolicy, optional): Defaults to OverflowPolicy.DEFER.
+                clock (optional): Time source for the window. Defaults to RealClock().
+                max_deferred (int, optional): Bound on the deferred backlog; beyond it new
+                                              stops are shed. Defaults to max_pending.
+        """
+        if max_pending is not None and max_pending < 1:
+            raise ValueError("max_pending must be >= 1 or None")
+        if max_deferred is not None and max_deferred < 0:
+            raise ValueError("max_deferred must be >= 0 or None")
+        self.window = window
+        self.max_pending = max_pending
+        self.max_deferred = max_deferred if max_deferred is not None else max_pending
+        self.overflow_policy = overflow_policy
+        self.clock = clock if clock is not None else RealClock()
+        self._pending = []       # HallCall objects, in arrival order
+        self._open_calls = {}    # (floor, direction) -> most recent pending HallCall
+        self._handed_out = {}    # id(stop) -> HallCall, for the stops of the last drain
+        self._assigned = {}      # (floor, direction) -> (HallCall, Elevator), while the window is open
+        self._deferred = deque()
+        self.submitted = 0
+        self.merged = 0
+        self.deferred = 0
+        self.shed = 0
+        self.dispatched = 0
+
+
+    def submit(self, request, now=None):
+        """
+            Offer a request to the ingestion stage.
+
+            Args:
+                request (ElevatorRequest): The incoming request.
+                now (float, optional): Arrival time. Defaults to clock.now().
+
+            Returns:
+                str: 'accepted', 'merged', 'deferred', 'shed', 'rejected' (same floor), or
+                     'joined' when it joined a stop already assigned to an elevator
+                     (see `get_assignment()`).
+        """
+        self.submitted += 1
+        if request.start_floor == request.destination_floor:
+            return 'rejected'
+        return self._admit(request, self.clock.now() if now is None else now, can_join=True)
+
+
+    def _admit(self, request, now, can_join=False):
+        key = (request.start_floor, request.direction)
+        open_call = self._open_calls.get(key)
+        if open_call is not None and now - open_call.opened_at <= self.window:
+            open_call.add_rider(request)
+            self.merged += 1
+            return 'merged'
+
+        assigned = self._assigned.get(key)
+        if can_join and assigned is not None and now - assigned[0].opened_at <= self.window:
+            hall_call, elevator = assigned
+            if elevator.join_stop(hall_call, request):
+                self.merged += 1
+                return 'joined'
+
+        if self.max_pending is not None and len(self._pending) >= self.max_pending:
+            if self.overflow_policy == OverflowPolicy.SHED or len(self._deferred) >= self.max_deferred:
+                self.shed += 1
+                print(f"<< Request shed (queue full): {request} >>")
+                return 'shed'
+            self._deferred.append(request)
+            self.deferred += 1
+            print(f"<< Request deferred (queue full): {request} >>")
+            return 'deferred'
+
+        hall_call = HallCall(request, opened_at=now)
+        self._pending.append(hall_call)
+        self._open_calls[key] = hall_call
+        return 'accepted'
+
+
+    def drain(self, now=None):
+        """
+            Hand all pending stops to the caller, then re-admit deferred requests
+            for the next drain (at most `max_pending` of them).
+
+            Stops with a single rider are returned as the original request.
+            Call it once per dispatch round; deferred requests wait for the next one.
+
+            Args:
+                now (float, optional): Time used when re-admitting deferred requests.
+
+            Returns:
+                list: ElevatorRequest / HallCall objects, one per distinct stop.
+        """
+        stops = []
+        self._handed_out = {}
+        for call in self._pending:
+            stop = call.riders[0] if len(call.riders) == 1 else call
+            self._handed_out[id(stop)] = call
+            stops.append(stop)
+        self.dispatched += len(stops)
+        self._pending = []
+        self._open_calls = {}
+
+        now = self.clock.now() if now is None else now
+        self._assigned = {key: assigned for key, assigned in self._assigned.items()
+                          if now - assigned[0].opened_at <= self.window}
+        while self._deferred and (self.max_pending is None or len(self._pending) < self.max_pending):
+            self._admit(self._deferred.popleft(), now)
+        return stops
+
+
+    def assign(self, stop, elevator):
+        """
+            Report where a drained stop went, so calls arriving later in its window can join it.
+
+            Args:
+                stop: A stop returned by the last `drain()`.
+                elevator (Elevator): The elevator it was assigned to.
+        """
+        call = self._handed_out.pop(id(stop), None)
+        if call is not None:
+            self._assigned[(call.start_floor, call.direction)] = (call, elevator)
+
+
+    def get_assignment(self, request):
+        """
+            Returns:
+                Elevator or None: The elevator holding the assigned stop `request` would join.
+        """
+        assigned = self._assigned.get((request.start_floor, request.direction))
+        return assigned[1] if assigned is not None else None
+
+
+    def has_pending(self):
+        """
+            Returns:
+                bool: True if any stop is pending or deferred, i.e. another drain is needed.
+        """
+        return bool(self._pending or self._deferred)
+
+
+    def __len__(self):
+        return len(self._pending)
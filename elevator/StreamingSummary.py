@@ -0,0 +1,184 @@
+import csv
+import gzip
+import threading
+from collections import Counter
+
+
+class StreamingSummary:
+    """
+        Constant-memory movement summary for a simulation run.
+
+        Instead of keeping every assigned request, each elevator keeps running
+        aggregates: requests assigned, riders carried, requested travel (floors)
+        and an origin → destination heatmap. The heatmap is bounded by the number
+        of floor pairs, not by run length. Full assignment records (one row per
+        rider, so a coalesced stop keeps every origin/destination) can optionally
+        be spilled to a gzip-compressed CSV file.
+
+        Attributes:
+            spill_path (str or None): Where assignment records are written, if anywhere.
+            top_routes (int): How many heatmap entries `print_report` shows per elevator.
+            lock (threading.Lock): Guards the aggregates across threads.
+
+        Example:
+            summary = StreamingSummary(["E1", "E2"], spill_path="assignments.csv.gz")
+            summary.record("E1", ElevatorRequest(1, 5))
+            summary.print_report()
+            summary.close()
+    """
+    SPILL_HEADER = ('event', 'elevator', 'from_elevator', 'start_floor', 'destination_floor')
+
+    def __init__(self, elevator_names=(), spill_path=None, top_routes=3):
+        """
+            Initialize the StreamingSummary object.
+
+            Args:
+                elevator_names (iterable, optional): Elevators to report on, in order.
+                spill_path (str, optional): gzip CSV file for full records. Defaults to None.
+                top_routes (int, optional): Heatmap entries shown per elevator. Defaults to 3.
+        """
+        self.spill_path = spill_path
+        self.top_routes = top_routes
+        self.lock = threading.Lock()
+        self._stats = {}
+        for name in elevator_names:
+            self._get_stats(name)
+        self._spill_file = None
+        self._spill_writer = None
+        if spill_path is not None:
+            self._spill_file = gzip.open(spill_path, 'wt', newline='')
+            self._spill_writer = csv.writer(self._spill_file)
+            self._spill_writer.writerow(self.SPILL_HEADER)
+
+
+    @classmethod
+    def from_assignments(cls, summary_dict):
+        """
+            Build a summary from a {elevator_name: [requests]} dictionary.
+
+            Args:
+                summary_dict (dict): Dictionary of elevator names and their handled requests.
+
+            Returns:
+                StreamingSummary: The aggregated summary.
+        """
+        summary = cls(summary_dict.keys())
+        for elevator_name, requests in summary_dict.items():
+            for request in requests:
+                summary.record(elevator_name, request)
+        return summary
+
+
+    def _get_stats(self, elevator_name):
+        stats = self._stats.get(elevator_name)
+        if stats is None:
+            stats = {'requests': 0, 'riders': 0, 'requested_floors': 0, 'routes': Counter()}
+            self._stats[elevator_name] = stats
+        return stats
+
+
+    @staticmethod
+    def _riders(request):
+        return getattr(request, 'riders', (request,))
+
+
+    def _apply(self, elevator_name, request, sign, stops=1):
+        stats = self._get_stats(elevator_name)
+        riders = self._riders(request)
+        stats['requests'] += sign * stops
+        stats['riders'] += sign * len(riders)
+        for rider in riders:
+            stats['requested_floors'] += sign * abs(rider.destination_floor - rider.start_floor)
+            route = (rider.start_floor, rider.destination_floor)
+            stats['routes'][route] += sign
+            if stats['routes'][route] == 0:
+                del stats['routes'][route]
+
+
+    def _spill(self, event, elevator_name, from_name, request):
+        if self._spill_writer is None:
+            return
+        for rider in self._riders(request):
+            self._spill_writer.writerow((event, elevator_name, from_name, rider.start_floor, rider.destination_floor))
+
+
+    def record(self, elevator_name, request):
+        """
+            Account for a request assigned to an elevator.
+
+            Args:
+                elevator_name (str): The elevator that got the request.
+                request: An ElevatorRequest or HallCall.
+        """
+        with self.lock:
+            self._apply(elevator_name, request, 1)
+            self._spill('assign', elevator_name, '', request)
+
+
+    def add_rider(self, elevator_name, rider):
+        """
+            Account for a rider who joined a stop already assigned to an elevator.
+            The stop itself was counted by `record()`, so only rider aggregates change.
+
+            Args:
+                elevator_name (str): The elevator holding the stop.
+                rider (ElevatorRequest): The rider who joined.
+        """
+        with self.lock:
+            self._apply(elevator_name, rider, 1, stops=0)
+            self._spill('join', elevator_name, '', rider)
+
+
+    def move(self, request, from_name, to_name):
+        """
+            Account for a request reassigned from one elevator to another.
+
+            Args:
+                request: The moved ElevatorRequest or HallCall.
+                from_name (str): The elevator that gave it up.
+                to_name (str): The elevator that took it over.
+        """
+        with self.lock:
+            self._apply(from_name, request, -1)
+            self._apply(to_name, request, 1)
+            self._spill('move', to_name, from_name, request)
+
+
+    def get_stats(self, elevator_name):
+        """
+            Returns:
+                dict: Copy of the elevator's aggregates ('requests', 'riders',
+                      'requested_floors', 'routes').
+        """
+        with self.lock:
+            stats = self._get_stats(elevator_name)
+            return dict(stats, routes=Counter(stats['routes']))
+
+
+    def print_report(self):
+        """
+            Prints the per-elevator movement summary. Output size depends on the
+            number of elevators and `top_routes`, never on the run length.
+        """
+        print("\nMOVEMENT SUMMARY:")
+        print("----------------------")
+        with self.lock:
+            for elevator_name, stats in self._stats.items():
+                routes = ", ".join(f"{start} → {destination} x{count}"
+                                   for (start, destination), count in stats['routes'].most_common(self.top_routes))
+                print(f"{elevator_name} : {stats['requests']} requests | {stats['riders']} riders | "
+                      f"requested travel: {stats['requested_floors']} floors | "
+                      f"top routes: [{routes}]")
+        if self.spill_path is not None:
+            print(f"(full assignment records: {self.spill_path})")
+
+
+    def close(self):
+        """
+            Flush and close the spill file, if any.
+        """
+        with self.lock:
+            if self._spill_file is not None:
+                self._spill_file.close()
+                self._spill_file = None
+                self._spill_writer = None
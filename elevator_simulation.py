@@ -1,7 +1,12 @@
-import time, json
+import json
+from functools import partial
+from elevator.Clock import RealClock
+from elevator.Dispatcher import Dispatcher
 from elevator.Elevator import Elevator
 from elevator.ElevatorRequest import ElevatorRequest
-from elevator.ElevatorStatus import ElevatorStatus
+from elevator.Rebalancer import Rebalancer
+from elevator.RequestIngestor import RequestIngestor
+from elevator.StreamingSummary import StreamingSummary
 
 
 def get_int_input(prompt, min_val=1):
@@ -134,48 +139,95 @@ def main():
             print(end="\n")
 
             # to run simulation
-            run_simulation(elevators, cleaned_elevator_requests)
+            run_simulation(elevators, cleaned_elevator_requests, rebalancer=Rebalancer(elevators))
             break
 
 
-def run_simulation(elevators, elevator_requests):
+def run_simulation(elevators, elevator_requests, ingestor=None, profiler=None, clock=None, rebalancer=None,
+                   summary=None, decision_cache=None):
     """
         Runs the simulation by assigning requests to elevators and monitoring completion.
 
+        Requests are submitted to a Dispatcher thread. It runs them through a RequestIngestor,
+        which merges duplicate hall calls and applies admission control, so the
+        dispatcher decides once per distinct stop.
+
         Args:
             elevators (list): List of Elevator objects.
             elevator_requests (list): List of ElevatorRequest objects.
+            ingestor (RequestIngestor, optional): Ingestion stage. Defaults to RequestIngestor().
+            profiler (PhaseProfiler, optional): Times each dispatch call and prints a phase
+                                                report at the end. Defaults to None (disabled).
+            clock (optional): Time source for the completion wait and the default ingestor.
+                              Defaults to RealClock(); pass the same clock the elevators use.
+            rebalancer (Rebalancer, optional): Moves queued requests between elevators while
+                                               the simulation runs. Defaults to None (disabled).
+            summary (StreamingSummary, optional): Constant-memory summary, e.g. with a spill file.
+                                                  Defaults to StreamingSummary() over the elevators.
+            decision_cache (DecisionCache, optional): Memoizes dispatch decisions and prints
+                                                      its hit rate at the end. Defaults to None.
     """
-    summary_dict = dict()
-
-    # Start all elevator threads
-    for elevator in elevators:
-        elevator.start()
-        summary_dict[elevator.name] = []
-
-    print("Assigning elevator requests...\n")
-
-    # Assign requests to elevators (simple greedy logic)
-    for request in elevator_requests:
-        best_elevator = find_best_elevator(request, elevators)
-        best_elevator.assign_request(request)
-        summary_dict[best_elevator.name].append(request)
-
-
-    # Wait for all elevators to finish their assigned requests
-    all_done = False
-    while not all_done:
-        time.sleep(1)  # check every second
-        all_done = all(len(elevator.requests) == 0 and elevator.status == ElevatorStatus.IDLE for elevator in elevators)
-
-    # Stop elevators after work is done
-    for elevator in elevators:
-        elevator.stop()
-
-    for elevator in elevators:
-        elevator.join()  # Wait for threads to stop
-
-    get_summary(summary_dict, elevators)
+    if summary is None:
+        summary = StreamingSummary(elevator.name for elevator in elevators)
+    if clock is None:
+        clock = RealClock()
+    if ingestor is None:
+        ingestor = RequestIngestor(clock=clock)
+
+    # Simulated time must not move while this thread is dispatching (matters for ManualClock)
+    dispatcher = None
+    clock.register()
+    try:
+        # Start all elevator threads
+        for elevator in elevators:
+            elevator.start()
+        if rebalancer is not None:
+            if rebalancer.summary is None:
+                rebalancer.summary = summary
+            rebalancer.start()
+
+        print("Assigning elevator requests...\n")
+
+        # Assign distinct stops to elevators (simple greedy logic), batch by batch
+        weights = load_weights()
+        dispatcher = Dispatcher(elevators, partial(find_best_elevator, weights=weights, cache=decision_cache),
+                                ingestor=ingestor, summary=summary, profiler=profiler)
+        dispatcher.start()
+        tickets = [dispatcher.submit(request) for request in elevator_requests]
+        for ticket in tickets:
+            while not ticket.wait(timeout=0.1):
+                if not dispatcher.is_alive() and not ticket.done():
+                    raise RuntimeError(f"Dispatcher stopped before deciding [{ticket.request}]")
+            ticket.raise_for_error()
+        dispatcher.stop()
+        dispatcher.join()
+
+        # Wait for all elevators to finish their assigned requests
+        all_done = False
+        while not all_done:
+            clock.sleep(1)  # check every (simulated) second
+            all_done = all(snapshot.is_done for snapshot in get_fleet_snapshot(elevators))
+    finally:
+        # Stop elevators after work is done (or on error); signal every thread before giving up simulated time
+        if dispatcher is not None:
+            dispatcher.stop()
+        if rebalancer is not None:
+            rebalancer.stop()
+        for elevator in elevators:
+            elevator.stop()
+        clock.unregister()  # the joins below must not hold simulated time back
+
+        # Wait for threads to stop, and flush the spill file, even when dispatching failed
+        for thread in [dispatcher, rebalancer, *elevators]:
+            if thread is not None and thread.ident is not None:
+                thread.join()
+        summary.close()
+
+    get_summary(summary, elevators)
+    if profiler:
+        profiler.print_report()
+    if decision_cache is not None:
+        decision_cache.print_report()
 
 
 # original logic
@@ -209,45 +261,83 @@ def run_simulation(elevators, elevator_requests):
 #     return idle_closest[0] if idle_closest else closest_elevators[0]
 
 
+def get_fleet_snapshot(elevators):
+    """
+        Capture the latest published snapshot of every elevator without taking any lock.
+
+        The cars are read one after another, so a request moved between two of them
+        (`Elevator.transfer_request`) could be missed by a single pass. The fleet is
+        therefore read again until no snapshot version changed between two passes,
+        which guarantees the result is the state of the whole fleet at one instant.
+
+        Args:
+            elevators (list): List of Elevator objects.
+
+        Returns:
+            tuple: ElevatorSnapshot objects, in the same order as `elevators`.
+    """
+    fleet = tuple(elevator.snapshot() for elevator in elevators)
+    while True:
+        again = tuple(elevator.snapshot() for elevator in elevators)
+        if all(first.version == second.version for first, second in zip(fleet, again)):
+            return again
+        fleet = again
+
+
 def load_weights(filepath="weights.json"):
     with open(filepath, 'r') as file:
         return json.load(file)
 
 
 # enhanced logic
-def find_best_elevator(request, elevators):
+def find_best_elevator(request, elevators, fleet=None, weights=None, cache=None):
     """
     Return the best elevator for a given request, based on:
     - Direction compatibility
     - Pickup/drop-off alignment with elevator path
     - Distance
     - Request load
+
+    Scores are computed from one fleet snapshot, so every candidate is judged
+    on a consistent state without locking the running elevators. A caller that
+    dispatches a batch can pass its own `fleet` snapshot and pre-loaded `weights`.
+
+    With a DecisionCache, a repeat request against the same (quantized) fleet
+    state reuses the earlier decision instead of scoring every candidate.
     """
-    weights = load_weights()
+    if weights is None:
+        weights = load_weights()
+    if fleet is None:
+        fleet = get_fleet_snapshot(elevators)
+    if cache is not None:
+        key = cache.make_key(request, fleet, weights)
+        index = cache.get(key)
+        if index is not None:
+            return elevators[index]
     candidates = []
 
-    for elevator in elevators:
-        distance = abs(elevator.current_floor - request.start_floor)
-        is_idle = elevator.status == ElevatorStatus.IDLE
-        load = len(elevator.requests)
+    for elevator, snapshot in zip(elevators, fleet):
+        distance = abs(snapshot.current_floor - request.start_floor)
+        is_idle = snapshot.is_idle
+        load = len(snapshot.requests)
         going_up = request.direction == 'up'
         can_pick_on_route = False
 
         if is_idle:
             can_pick_on_route = True
-        elif elevator.requests:
-            first_req = elevator.requests[0]
-            elevator_direction = 'up' if first_req.destination_floor > elevator.current_floor else 'down'
+        elif snapshot.requests:
+            first_req = snapshot.requests[0]
+            elevator_direction = 'up' if first_req.destination_floor > snapshot.current_floor else 'down'
 
             # Pickup between current position and destination, same direction
             if going_up and elevator_direction == 'up':
                 can_pick_on_route = (
-                    elevator.current_floor <= request.start_floor <= first_req.destination_floor and
+                    snapshot.current_floor <= request.start_floor <= first_req.destination_floor and
                     request.start_floor < request.destination_floor <= first_req.destination_floor
                 )
             elif not going_up and elevator_direction == 'down':
                 can_pick_on_route = (
-                    elevator.current_floor >= request.start_floor >= first_req.destination_floor and
+                    snapshot.current_floor >= request.start_floor >= first_req.destination_floor and
                     request.start_floor > request.destination_floor >= first_req.destination_floor
                 )
 
@@ -261,43 +351,37 @@ def find_best_elevator(request, elevators):
         candidates.append((elevator, score))
 
     best_elevator = max(candidates, key=lambda x: x[1])[0]
+    if cache is not None:
+        cache.put(key, elevators.index(best_elevator))
     return best_elevator
 
 
-def get_summary(summary_dict, elevators):
+def get_summary(summary, elevators):
     """
         Prints a summary of elevator movements and efficiency scores.
 
         Args:
-            summary_dict (dict): Dictionary of elevator names and their handled requests.
+            summary (StreamingSummary or dict): Running aggregates, or a dictionary of
+                                                elevator names and their handled requests.
             elevators (list): List of Elevator objects.
     """
-    print("\nMOVEMENT SUMMARY:")
-    print("----------------------")
-    for elevator_name, requests in summary_dict.items():
-        print(f"{elevator_name} :", end=" [")
-        if requests:
-            for request in requests:
-                if request is requests[-1]:
-                    print(request, end="]\n")
-                else:
-                    print(request, end=", ")
-        else:
-            print(" ]")
+    if isinstance(summary, dict):
+        summary = StreamingSummary.from_assignments(summary)
+    summary.print_report()
 
     print("\nELEVATOR EFFICIENCY SCORES:")
     print("--------------------------------")
-    for elevator in elevators:
+    for snapshot in get_fleet_snapshot(elevators):
         score = 0
         total_time = 0
         stops = 0
-        if elevator.total_movement != 0:
-            score = elevator.get_efficiency_score()
-            total_time = elevator.total_time
-            stops = elevator.stops
+        if snapshot.total_movement != 0:
+            score = snapshot.get_efficiency_score()
+            total_time = snapshot.total_time
+            stops = snapshot.stops
 
-        print(f"| {elevator.name} SCORE= {score:.4f} |\n"
-              f"| Movement: {elevator.total_movement} floors |\n"
+        print(f"| {snapshot.name} SCORE= {score:.4f} |\n"
+              f"| Movement: {snapshot.total_movement} floors |\n"
               f"| Stops: {stops} stops |\n"
               f"| Time: {total_time}s |\n")
 
@@ -0,0 +1,117 @@
+import threading
+import time
+import unittest
+from elevator.Clock import DilatedClock, ManualClock, RealClock
+
+
+class TestClock(unittest.TestCase):
+
+    def test_manual_clock_auto_advance(self):
+        # ARRANGE
+        clock = ManualClock(auto_advance=True)
+
+        # ACT
+        clock.sleep(2)
+        clock.sleep(1)
+
+        # ASSERT
+        self.assertEqual(3, clock.now())
+
+
+    def test_manual_clock_step_mode(self):
+        # ARRANGE
+        clock = ManualClock()
+        woke = threading.Event()
+
+        def sleeper():
+            clock.sleep(2)
+            woke.set()
+
+        thread = threading.Thread(target=sleeper)
+        thread.start()
+
+        # ACT
+        clock.advance(1)
+        still_sleeping = not woke.wait(0.05)
+        clock.advance(1)
+        thread.join(timeout=1)
+
+        # ASSERT
+        self.assertTrue(still_sleeping)
+        self.assertTrue(woke.is_set())
+        self.assertEqual(2, clock.now())
+
+
+    def test_dilated_clock(self):
+        # ARRANGE
+        clock = DilatedClock(1000)
+
+        # ACT
+        started = time.monotonic()
+        clock.sleep(2)
+        wall_seconds = time.monotonic() - started
+
+        # ASSERT
+        self.assertLess(wall_seconds, 1)
+        self.assertGreaterEqual(clock.now(), 2)
+
+
+    def test_invalid_dilation_factor(self):
+        with self.assertRaises(ValueError):
+            DilatedClock(0)
+
+
+    def test_real_clock_is_monotonic(self):
+        clock = RealClock()
+        self.assertLessEqual(clock.now(), clock.now())
+
+
+    def test_manual_clock_virtual_time_waits_for_every_participant(self):
+        # ARRANGE
+        clock = ManualClock(auto_advance=True)
+        log = []
+
+        def worker(name, step):
+            for _ in range(3):
+                clock.sleep(step)
+                log.append((clock.now(), name))
+            clock.unregister()
+
+        threads = [threading.Thread(target=worker, args=("slow", 2)), threading.Thread(target=worker, args=("fast", 1))]
+        for thread in threads:
+            clock.register(thread)
+
+        # ACT
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        # ASSERT
+        # released in (wake time, registration order); "slow" registered first and wins ties at t=2
+        self.assertEqual([(1, "fast"), (2, "slow"), (2, "fast"), (3, "fast"), (4, "slow"), (6, "slow")], log)
+
+
+    def test_manual_clock_holds_time_for_running_participant(self):
+        # ARRANGE
+        clock = ManualClock(auto_advance=True)
+        clock.register()  # this thread is busy, so time must not move
+        woke = threading.Event()
+
+        def sleeper():
+            clock.sleep(1)
+            woke.set()
+
+        thread = threading.Thread(target=sleeper)
+        clock.register(thread)
+        thread.start()
+
+        # ACT
+        held = not woke.wait(0.05)
+        clock.unregister()
+        thread.join(timeout=1)
+
+        # ASSERT
+        self.assertTrue(held)
+        self.assertTrue(woke.is_set())
+        self.assertEqual(1, clock.now())
@@ -0,0 +1,135 @@
+import unittest
+from io import StringIO
+from unittest.mock import patch
+from functools import partial
+from elevator.DecisionCache import DecisionCache
+from elevator.Dispatcher import Dispatcher
+from elevator.Elevator import Elevator
+from elevator.ElevatorRequest import ElevatorRequest
+from elevator.ElevatorStatus import ElevatorStatus
+from elevator.RequestIngestor import RequestIngestor
+from elevator_simulation import find_best_elevator, get_fleet_snapshot
+
+WEIGHTS = {"idle_bonus": 5, "inline_pickup_bonus": 3, "distance_penalty": 0.2, "load_penalty": 0.5}
+
+
+class TestDecisionCache(unittest.TestCase):
+
+    def test_repeat_request_hits(self):
+        # ARRANGE
+        cache = DecisionCache()
+        elevators = [Elevator("E1", 1), Elevator("E2", 10)]
+
+        # ACT
+        first = find_best_elevator(ElevatorRequest(1, 8), elevators, weights=WEIGHTS, cache=cache)
+        second = find_best_elevator(ElevatorRequest(1, 8), elevators, weights=WEIGHTS, cache=cache)
+
+        # ASSERT
+        self.assertIs(first, second)
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(1, cache.misses)
+        self.assertEqual(0.5, cache.hit_rate)
+
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_state_change_invalidates(self, mock_stdout):
+        # ARRANGE
+        cache = DecisionCache()
+        elevators = [Elevator("E1", 1), Elevator("E2", 3)]
+        request = ElevatorRequest(2, 8)
+        first = find_best_elevator(request, elevators, weights=WEIGHTS, cache=cache)
+
+        # ACT
+        first.status = ElevatorStatus.MOVING_UP
+        first.assign_request(ElevatorRequest(9, 1))
+        second = find_best_elevator(request, elevators, weights=WEIGHTS, cache=cache)
+
+        # ASSERT
+        self.assertEqual(0, cache.hits)
+        self.assertIsNot(first, second)
+        self.assertIs(second, find_best_elevator(request, elevators, weights=WEIGHTS))
+
+
+    def test_weights_change_misses(self):
+        # ARRANGE
+        cache = DecisionCache()
+        elevators = [Elevator("E1", 1)]
+        find_best_elevator(ElevatorRequest(1, 8), elevators, weights=WEIGHTS, cache=cache)
+
+        # ACT
+        find_best_elevator(ElevatorRequest(1, 8), elevators, weights=dict(WEIGHTS, idle_bonus=1), cache=cache)
+
+        # ASSERT
+        self.assertEqual(0, cache.hits)
+        self.assertEqual(2, len(cache))
+
+
+    def test_quantized_positions_share_entry(self):
+        # ARRANGE
+        cache = DecisionCache(floor_quantum=4)
+        request = ElevatorRequest(1, 8)
+        fleet_a = get_fleet_snapshot([Elevator("E1", 4)])
+        fleet_b = get_fleet_snapshot([Elevator("E1", 7)])
+
+        # ACT / ASSERT
+        self.assertEqual(cache.make_key(request, fleet_a, WEIGHTS), cache.make_key(request, fleet_b, WEIGHTS))
+
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_dispatcher_hits_under_steady_load(self, mock_stdout):
+        # ARRANGE
+        cache = DecisionCache()
+        elevators = [Elevator("E1", 1), Elevator("E2", 1), Elevator("E3", 10)]
+        dispatcher = Dispatcher(elevators, partial(find_best_elevator, weights=WEIGHTS, cache=cache),
+                                ingestor=RequestIngestor(window=0))
+        requests = [ElevatorRequest(1, 2 + index % 10) for index in range(200)]  # up-peak from the lobby
+
+        # ACT
+        dispatcher.start()
+        tickets = [dispatcher.submit(request) for request in requests]
+        dispatcher.stop()
+        dispatcher.join()
+
+        # ASSERT
+        self.assertEqual(['assigned'] * 200, [ticket.status for ticket in tickets])
+        self.assertEqual(200, cache.hits + cache.misses)
+        self.assertGreater(cache.hit_rate, 0.5)  # every assignment changes the loads, yet states recur
+
+
+    def test_same_load_difference_shares_entry(self):
+        # ARRANGE
+        cache = DecisionCache()
+        request = ElevatorRequest(1, 5)
+        light = [Elevator("E1", 1), Elevator("E2", 10)]
+        heavy = [Elevator("E1", 1), Elevator("E2", 10)]
+        light[0].requests = [ElevatorRequest(2, 3), ElevatorRequest(4, 6)]
+        light[1].requests = [ElevatorRequest(9, 8)]
+        heavy[0].requests = [ElevatorRequest(2, 3)] + [ElevatorRequest(4, 6)] * 3
+        heavy[1].requests = [ElevatorRequest(9, 8)] + [ElevatorRequest(7, 2)] * 2
+
+        # ACT
+        light_key = cache.make_key(request, get_fleet_snapshot(light), WEIGHTS)
+        heavy_key = cache.make_key(request, get_fleet_snapshot(heavy), WEIGHTS)
+
+        # ASSERT (E1 carries one more request than E2 in both fleets)
+        self.assertEqual(light_key, heavy_key)
+        self.assertEqual(light.index(find_best_elevator(request, light, weights=WEIGHTS)),
+                         heavy.index(find_best_elevator(request, heavy, weights=WEIGHTS)))
+
+
+    def test_lru_eviction(self):
+        # ARRANGE
+        cache = DecisionCache(max_size=2)
+
+        # ACT
+        cache.put("a", 0)
+        cache.put("b", 1)
+        cache.get("a")      # "b" becomes least recently used
+        cache.put("c", 0)
+
+        # ASSERT
+        self.assertEqual(1, cache.evictions)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(0, cache.get("a"))
+        cache.invalidate()
+        self.assertEqual(0, len(cache))
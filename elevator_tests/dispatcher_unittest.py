@@ -0,0 +1,197 @@
+import threading
+import unittest
+from io import StringIO
+from unittest.mock import patch
+from elevator.Dispatcher import Dispatcher
+from elevator.Elevator import Elevator
+from elevator.ElevatorRequest import ElevatorRequest
+from elevator.HallCall import HallCall
+from elevator.OverflowPolicy import OverflowPolicy
+from elevator.RequestIngestor import RequestIngestor
+from elevator.StreamingSummary import StreamingSummary
+from elevator_simulation import find_best_elevator
+
+
+class TestDispatcher(unittest.TestCase):
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_many_producers(self, mock_stdout):
+        # ARRANGE
+        elevators = [Elevator("E1", 1), Elevator("E2", 10)]
+        summary = StreamingSummary(["E1", "E2"])
+        dispatcher = Dispatcher(elevators, find_best_elevator, ingestor=RequestIngestor(window=0),
+                                summary=summary, batch_size=16)
+        tickets = []
+        tickets_lock = threading.Lock()
+
+        def producer(start_floor):
+            submitted = [dispatcher.submit(ElevatorRequest(start_floor, floor)) for floor in range(1, 11)]
+            with tickets_lock:
+                tickets.extend(submitted)
+
+        producers = [threading.Thread(target=producer, args=(floor,)) for floor in range(1, 9)]
+
+        # ACT
+        dispatcher.start()
+        for thread in producers:
+            thread.start()
+        for thread in producers:
+            thread.join()
+        dispatcher.stop()
+        dispatcher.join()
+
+        # ASSERT
+        self.assertEqual(80, len(tickets))
+        self.assertTrue(all(ticket.done() for ticket in tickets))
+        assigned = [ticket for ticket in tickets if ticket.status == 'assigned']
+        rejected = [ticket for ticket in tickets if ticket.status == 'rejected']
+        self.assertEqual(8, len(rejected))  # one same-floor request per producer
+        self.assertEqual(72, len(assigned))
+        self.assertEqual(72, summary.get_stats("E1")['riders'] + summary.get_stats("E2")['riders'])
+        self.assertLessEqual(dispatcher.batches, 80)
+
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_coalesced_riders_all_acknowledged(self, mock_stdout):
+        # ARRANGE
+        elevator = Elevator("E1", 1)
+        dispatcher = Dispatcher([elevator], find_best_elevator, batch_size=10)
+        tickets = [dispatcher.submit(ElevatorRequest(1, floor)) for floor in (5, 7, 9)]
+
+        # ACT
+        dispatcher.start()
+        dispatcher.stop()
+        dispatcher.join()
+
+        # ASSERT
+        self.assertEqual(['assigned'] * 3, [ticket.status for ticket in tickets])
+        self.assertEqual(['E1'] * 3, [ticket.elevator_name for ticket in tickets])
+        self.assertEqual(1, len(elevator.requests))  # one stop for three button presses
+        self.assertEqual(1, dispatcher.batches)
+
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_duplicate_in_later_batch_joins_assigned_stop(self, mock_stdout):
+        # ARRANGE
+        elevator = Elevator("E1", 10)  # not started, so the stop is never picked up
+        summary = StreamingSummary(["E1"])
+        ingestor = RequestIngestor(window=5)
+        dispatcher = Dispatcher([elevator], find_best_elevator, ingestor=ingestor, summary=summary)
+        dispatcher.start()
+
+        # ACT
+        first = dispatcher.submit(ElevatorRequest(1, 5))
+        first.wait(timeout=5)
+        second = dispatcher.submit(ElevatorRequest(1, 5))
+        second.wait(timeout=5)
+        third = dispatcher.submit(ElevatorRequest(1, 8))
+        third.wait(timeout=5)
+        dispatcher.stop()
+        dispatcher.join()
+
+        # ASSERT
+        self.assertGreaterEqual(dispatcher.batches, 3)
+        self.assertEqual(['assigned'] * 3, [ticket.status for ticket in (first, second, third)])
+        self.assertEqual(['E1'] * 3, [ticket.elevator_name for ticket in (first, second, third)])
+        self.assertEqual(2, ingestor.merged)
+        self.assertEqual(1, len(elevator.requests))  # one stop for three presses
+        self.assertIsInstance(elevator.requests[0], HallCall)
+        self.assertEqual((5, 8), elevator.requests[0].destination_floors)
+        self.assertEqual(1, summary.get_stats("E1")['requests'])
+        self.assertEqual(3, summary.get_stats("E1")['riders'])
+
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_deferred_requests_wait_for_later_batches(self, mock_stdout):
+        # ARRANGE
+        elevators = [Elevator("E1", 1), Elevator("E2", 10)]
+        ingestor = RequestIngestor(window=0, max_pending=1, max_deferred=8, overflow_policy=OverflowPolicy.DEFER)
+        dispatcher = Dispatcher(elevators, find_best_elevator, ingestor=ingestor, tick=0.01)
+        tickets = [dispatcher.submit(ElevatorRequest(floor, 20)) for floor in range(1, 11)]
+
+        # ACT
+        dispatcher.start()
+        for ticket in tickets:
+            ticket.wait(timeout=5)
+        dispatcher.stop()
+        dispatcher.join()
+
+        # ASSERT
+        statuses = [ticket.status for ticket in tickets]
+        self.assertEqual(['assigned'] * 9 + ['shed'], statuses)  # one pending + a backlog of eight
+        self.assertEqual(8, ingestor.deferred)
+        self.assertEqual(9, dispatcher.batches)  # at most one new stop per batch
+        self.assertEqual(9, sum(len(elevator.requests) for elevator in elevators))
+
+
+    @patch('sys.stderr', new_callable=StringIO)
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_failed_batch_resolves_every_ticket(self, mock_stdout, mock_stderr):
+        # ARRANGE
+        def broken_select(request, elevators, fleet):
+            raise ValueError("no elevator")
+
+        dispatcher = Dispatcher([Elevator("E1")], broken_select, ingestor=RequestIngestor(window=0))
+        tickets = [dispatcher.submit(ElevatorRequest(1, floor)) for floor in (3, 4, 5)]
+
+        # ACT
+        dispatcher.start()
+        dispatcher.join(timeout=5)
+
+        # ASSERT
+        self.assertFalse(dispatcher.is_alive())
+        self.assertIsInstance(dispatcher.error, ValueError)
+        self.assertTrue(all(ticket.done() for ticket in tickets))
+        self.assertEqual(['error'] * 3, [ticket.status for ticket in tickets])
+        with self.assertRaises(ValueError):
+            tickets[0].raise_for_error()
+        with self.assertRaises(RuntimeError):
+            dispatcher.submit(ElevatorRequest(1, 2))
+
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_submit_racing_stop_is_dispatched_or_refused(self, mock_stdout):
+        # ARRANGE
+        dispatcher = Dispatcher([Elevator("E1"), Elevator("E2", 10)], find_best_elevator,
+                                ingestor=RequestIngestor(window=0), batch_size=4)
+        accepted = []
+        refused = []
+        lock = threading.Lock()
+
+        def producer(start_floor):
+            for floor in range(11, 21):  # never the start floor, so the ingestor accepts them all
+                try:
+                    ticket = dispatcher.submit(ElevatorRequest(start_floor, floor))
+                except RuntimeError:
+                    with lock:
+                        refused.append(floor)
+                    continue
+                with lock:
+                    accepted.append(ticket)
+
+        producers = [threading.Thread(target=producer, args=(floor,)) for floor in range(1, 9)]
+
+        # ACT
+        dispatcher.start()
+        for thread in producers:
+            thread.start()
+        dispatcher.stop()
+        for thread in producers:
+            thread.join()
+        dispatcher.join(timeout=5)
+
+        # ASSERT
+        self.assertFalse(dispatcher.is_alive())
+        self.assertEqual(80, len(accepted) + len(refused))
+        self.assertTrue(all(ticket.done() for ticket in accepted))
+        self.assertNotIn('rejected', {ticket.status for ticket in accepted})
+
+
+    def test_submit_after_stop(self):
+        # ARRANGE
+        dispatcher = Dispatcher([Elevator("E1")], find_best_elevator)
+        dispatcher.stop()
+
+        # ACT / ASSERT
+        with self.assertRaises(RuntimeError):
+            dispatcher.submit(ElevatorRequest(1, 2))
@@ -1,9 +1,16 @@
+import gzip
+import os
+import tempfile
+import threading
 import unittest
 from io import StringIO
 from unittest.mock import patch, MagicMock
+from elevator.Clock import ManualClock
 from elevator.Elevator import Elevator
 from elevator.ElevatorRequest import ElevatorRequest
 from elevator.ElevatorStatus import  ElevatorStatus
+from elevator.Rebalancer import Rebalancer
+from elevator.StreamingSummary import StreamingSummary
 from elevator_simulation import (
     get_int_input,
     get_int_request_input,
@@ -11,6 +18,7 @@ from elevator_simulation import (
     get_bool_input,
     find_best_elevator,
     get_summary,
+    get_fleet_snapshot,
     run_simulation
 )
 
@@ -167,7 +175,7 @@ class TestElevatorSimulation(unittest.TestCase):
         e1.status = ElevatorStatus.IDLE
         e2 = Elevator("E2", starting_floor=5)
         e2.status = ElevatorStatus.MOVING_UP
-        e2.requests.append(ElevatorRequest(5, 10))
+        e2.assign_request(ElevatorRequest(5, 10))
         request = ElevatorRequest(2, 6)
 
         # ACT
@@ -177,6 +185,49 @@ class TestElevatorSimulation(unittest.TestCase):
         assert result == e1
 
 
+    def test_get_fleet_snapshot(self):
+        # ARRANGE
+        e1 = Elevator("E1", starting_floor=1)
+        e2 = Elevator("E2", starting_floor=7)
+        e2.assign_request(ElevatorRequest(7, 2))
+
+        # ACT
+        fleet = get_fleet_snapshot([e1, e2])
+        e2.current_floor = 6
+
+        # ASSERT
+        self.assertEqual(["E1", "E2"], [snapshot.name for snapshot in fleet])
+        self.assertEqual(7, fleet[1].current_floor)  # captured view is not affected by later moves
+        self.assertEqual(1, len(fleet[1].requests))
+        self.assertEqual(6, e2.snapshot().current_floor)
+
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_get_fleet_snapshot_is_consistent_during_transfer(self, mock_stdout):
+        # ARRANGE
+        e1 = Elevator("E1", starting_floor=1)
+        e2 = Elevator("E2", starting_floor=10)
+        request = ElevatorRequest(9, 5)
+        e2.assign_request(request)
+        read_e1 = e1.snapshot
+        transfers = []
+
+        def read_e1_then_transfer():
+            snapshot = read_e1()
+            if not transfers:  # move the request right after E1 was read, before E2 is
+                transfers.append(e2.transfer_request(request, e1))
+            return snapshot
+
+        # ACT
+        with patch.object(e1, 'snapshot', side_effect=read_e1_then_transfer):
+            fleet = get_fleet_snapshot([e1, e2])
+
+        # ASSERT
+        self.assertEqual([True], transfers)
+        self.assertFalse(all(snapshot.is_done for snapshot in fleet))
+        self.assertEqual([1, 0], [len(snapshot.requests) for snapshot in fleet])
+
+
     def test_get_summary_output(self):
         mock_elevator = Elevator("E1")
         mock_elevator.total_movement = 10
@@ -210,4 +261,66 @@ class TestElevatorSimulation(unittest.TestCase):
         assert len(elevator.requests) == 0  # should be processed
         elevator.start.assert_called_once()
         elevator.stop.assert_called_once()
-        elevator.join.assert_called_once()
\ No newline at end of file
+        elevator.join.assert_called_once()
+
+
+    def test_run_simulation_live_threads_with_manual_clock(self):
+        # ARRANGE
+        clock = ManualClock(auto_advance=True)
+        elevators = [Elevator("E1", 1, clock=clock), Elevator("E2", 10, clock=clock)]
+        requests = [ElevatorRequest(1, 4), ElevatorRequest(9, 2)]
+
+        # ACT
+        with patch('sys.stdout', new_callable=StringIO) as mock_out:
+            run_simulation(elevators, requests, clock=clock)
+            output = mock_out.getvalue()
+
+        # ASSERT
+        self.assertEqual(4, elevators[0].current_floor)
+        self.assertEqual(2, elevators[1].current_floor)
+        self.assertEqual(3, elevators[0].total_movement)
+        self.assertEqual(8, elevators[1].total_movement)
+        self.assertEqual([1, 2], [elevator.stops for elevator in elevators])
+        # virtual time: both cars are stopped at t=13, so each accounted 11 simulated seconds
+        self.assertEqual(13, clock.now())
+        self.assertEqual([11, 11], [elevator.total_time for elevator in elevators])
+        self.assertIn("ELEVATOR EFFICIENCY SCORES:", output)
+
+
+    @patch('sys.stderr', new_callable=StringIO)
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_run_simulation_raises_dispatcher_error(self, mock_stdout, mock_stderr):
+        # ARRANGE
+        clock = ManualClock(auto_advance=True)
+        threads_before = threading.active_count()
+
+        # ACT / ASSERT
+        with self.assertRaises(ValueError):  # no elevator to pick from
+            run_simulation([], [ElevatorRequest(1, 3)], clock=clock)
+        self.assertEqual(threads_before, threading.active_count())  # the dispatcher thread has exited
+
+
+    @patch('sys.stderr', new_callable=StringIO)
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_run_simulation_cleans_up_after_dispatcher_error(self, mock_stdout, mock_stderr):
+        # ARRANGE
+        clock = ManualClock(auto_advance=True)
+        elevators = [Elevator("E1", 1, clock=clock), Elevator("E2", 10, clock=clock)]
+        rebalancer = Rebalancer(elevators, clock=clock)
+
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, "assignments.csv.gz")
+            summary = StreamingSummary(["E1", "E2"], spill_path=filepath)
+
+            # ACT
+            with patch('elevator_simulation.find_best_elevator', side_effect=ValueError("scoring failed")):
+                with self.assertRaises(ValueError):
+                    run_simulation(elevators, [ElevatorRequest(1, 3)], clock=clock, rebalancer=rebalancer,
+                                   summary=summary)
+            with gzip.open(filepath, 'rt') as file:
+                header = file.readline()
+
+        # ASSERT
+        self.assertFalse(any(elevator.is_alive() for elevator in elevators))
+        self.assertFalse(rebalancer.is_alive())
+        self.assertTrue(header.startswith("event,"))  # spill file was closed and flushed
@@ -1,6 +1,6 @@
-import time
 import unittest
 from unittest.mock import patch
+from elevator.Clock import ManualClock
 from elevator.Elevator import Elevator
 from elevator.ElevatorRequest import ElevatorRequest
 from elevator.ElevatorStatus import  ElevatorStatus
@@ -22,25 +22,23 @@ class TestElevator(unittest.TestCase):
     @staticmethod
     def run_once(elevator):
         while elevator.requests:
-            with elevator.lock:
-                current_request = elevator.requests.pop(0)
+            current_request = elevator.take_next_request()
 
             if elevator.current_floor != current_request.start_floor:
                 elevator.move_to_floor(current_request.start_floor)
                 elevator.stops += 1
                 elevator.status = ElevatorStatus.LOADING
-                time.sleep(2)  # Mocked
+                elevator.clock.sleep(2)  # Manual clock, returns at once
 
             elevator.move_to_floor(current_request.destination_floor)
             elevator.stops += 1
 
     # test move to floor results in correct current floor, stops, total_movement, with 1 request
-    @patch("elevator.Elevator.time.sleep") # mocking time.sleep
-    def test_single_request(self, mock_sleep):
+    def test_single_request(self):
         print("\nTEST: test_single_request")
         print("=========================")
         # Arrange
-        elevator = Elevator("E1", starting_floor=1)
+        elevator = Elevator("E1", starting_floor=1, clock=ManualClock(auto_advance=True))
         request = ElevatorRequest(start_floor=1, destination_floor=3)
         elevator.assign_request(request)
 
@@ -55,12 +53,11 @@ class TestElevator(unittest.TestCase):
 
 
     # test move to floor results in correct current floor, stops, total_movement, with 2 request
-    @patch("elevator.Elevator.time.sleep") # mocking time.sleep
-    def test_multiple_request(self, mock_sleep):
+    def test_multiple_request(self):
         print("\nTEST: test_multiple_request")
         print("=========================")
         # Arrange
-        elevator = Elevator("E1", starting_floor=1)
+        elevator = Elevator("E1", starting_floor=1, clock=ManualClock(auto_advance=True))
         request_1 = ElevatorRequest(start_floor=3, destination_floor=1)
         elevator.assign_request(request_1)
         request_2 = ElevatorRequest(start_floor=2, destination_floor=5)
@@ -76,12 +73,11 @@ class TestElevator(unittest.TestCase):
 
         # test move to floor results in correct current floor, stops, total_movement, with 1 request
 
-    @patch("elevator.Elevator.time.sleep")  # mocking time.sleep
-    def test_get_efficiency_score(self, mock_sleep):
+    def test_get_efficiency_score(self):
         print("\nTEST: test_get_efficiency_score")
         print("=========================")
         # Arrange
-        elevator = Elevator("E1", starting_floor=1)
+        elevator = Elevator("E1", starting_floor=1, clock=ManualClock(auto_advance=True))
         request = ElevatorRequest(start_floor=1, destination_floor=5)
         elevator.assign_request(request)
 
@@ -99,4 +95,47 @@ class TestElevator(unittest.TestCase):
         print("=========================")
         elevator = Elevator("E1")
         elevator.start()
-        mock_start.assert_called_once()
\ No newline at end of file
+        mock_start.assert_called_once()
+
+    def test_snapshot_published_on_change(self):
+        print("\nTEST: test_snapshot_published_on_change")
+        print("=========================")
+        # Arrange
+        elevator = Elevator("E1", starting_floor=2)
+        before = elevator.snapshot()
+
+        # Act
+        elevator.assign_request(ElevatorRequest(2, 4))
+        elevator.status = ElevatorStatus.MOVING_UP
+        after = elevator.snapshot()
+
+        # Assert
+        self.assertEqual(0, len(before.requests))  # old snapshot is never mutated
+        self.assertTrue(before.is_done)
+        self.assertEqual(1, len(after.requests))
+        self.assertEqual(ElevatorStatus.MOVING_UP, after.status)
+        self.assertGreater(after.version, before.version)
+        self.assertFalse(after.is_done)
+        with self.assertRaises(AttributeError):
+            after.current_floor = 5
+
+
+    def test_queue_changes_always_published(self):
+        print("\nTEST: test_queue_changes_always_published")
+        print("=========================")
+        # Arrange
+        elevator = Elevator("E1")
+        elevator.assign_request(ElevatorRequest(1, 3))
+        elevator.assign_request(ElevatorRequest(2, 4))
+
+        # Act
+        taken = elevator.take_next_request()
+        snapshot = elevator.snapshot()
+
+        # Assert
+        self.assertEqual(1, taken.start_floor)
+        self.assertIs(taken, snapshot.current_request)
+        self.assertEqual(elevator.requests, snapshot.requests)
+        self.assertEqual(1, len(snapshot.requests))
+        with self.assertRaises(AttributeError):
+            elevator.requests.append(ElevatorRequest(5, 6))  # read-only view
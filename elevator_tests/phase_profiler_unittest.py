@@ -0,0 +1,152 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+from io import StringIO
+from unittest.mock import patch
+from elevator.Clock import DilatedClock, ManualClock
+from elevator.Dispatcher import Dispatcher
+from elevator.Elevator import Elevator
+from elevator.ElevatorRequest import ElevatorRequest
+from elevator.PhaseProfiler import PhaseProfiler
+from elevator_simulation import find_best_elevator
+
+
+class TestPhaseProfiler(unittest.TestCase):
+
+    # Run a real elevator thread until its single request is served
+    @staticmethod
+    def serve(elevator, request):
+        with patch('sys.stdout', new_callable=StringIO):
+            elevator.start()
+            elevator.assign_request(request)
+            deadline = time.monotonic() + 10
+            while not (elevator.snapshot().is_done and elevator.stops) and time.monotonic() < deadline:
+                pass
+            elevator.stop()
+            elevator.join()
+
+
+    # Run several real elevator threads at once until each has served its request
+    @staticmethod
+    def serve_fleet(elevators, request):
+        with patch('sys.stdout', new_callable=StringIO):
+            for elevator in elevators:
+                elevator.start()
+                elevator.assign_request(request)
+            deadline = time.monotonic() + 10
+            while not all(elevator.snapshot().is_done and elevator.stops for elevator in elevators) \
+                    and time.monotonic() < deadline:
+                time.sleep(0.001)
+            for elevator in elevators:
+                elevator.stop()
+            for elevator in elevators:
+                elevator.join()
+
+
+    def assert_every_car_collapsed(self, profiler):
+        clock = DilatedClock(200)  # keeps every thread busy for a few dozen milliseconds
+        elevators = [Elevator(name, starting_floor=1, profiler=profiler, clock=clock) for name in ("E1", "E2", "E3")]
+        self.serve_fleet(elevators, ElevatorRequest(1, 4))
+
+        stacks = profiler.get_collapsed_stacks()
+
+        self.assertEqual({"E1", "E2", "E3"}, {stack.split(";", 1)[0] for stack in stacks})
+
+
+    def test_record_phase(self):
+        # ARRANGE
+        profiler = PhaseProfiler()
+
+        # ACT
+        started = profiler.start()
+        profiler.stop("E1", "loading", started)
+        profiler.stop("E1", "loading", started)
+        stats = profiler.get_phase_stats()
+
+        # ASSERT
+        self.assertEqual(2, stats["E1"]["loading"]["count"])
+        self.assertGreaterEqual(stats["E1"]["loading"]["wall_ns"], stats["E1"]["loading"]["max_wall_ns"])
+
+
+    def test_elevator_phases_recorded(self):
+        # ARRANGE
+        profiler = PhaseProfiler()
+        elevator = Elevator("E1", starting_floor=1, profiler=profiler, clock=ManualClock(auto_advance=True))
+
+        # ACT
+        self.serve(elevator, ElevatorRequest(3, 5))
+        phases = profiler.get_phase_stats()["E1"]
+
+        # ASSERT
+        for phase in ('travel_to_pickup', 'loading', 'travel_to_destination', 'unloading'):
+            self.assertEqual(1, phases[phase]["count"])
+        self.assertEqual(5, elevator.current_floor)
+
+
+    @unittest.skipIf(sys.version_info >= (3, 12), "cProfile is interpreter-wide on Python 3.12+")
+    def test_cprofile_collapsed_output(self):
+        # ARRANGE
+        profiler = PhaseProfiler(cprofile=True, sampling=False)
+        elevator = Elevator("E1", starting_floor=1, profiler=profiler, clock=ManualClock(auto_advance=True))
+        self.serve(elevator, ElevatorRequest(1, 4))
+
+        # ACT
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, "stacks.txt")
+            profiler.write_collapsed(filepath)
+            with open(filepath) as file:
+                lines = file.read().splitlines()
+
+        # ASSERT
+        self.assertTrue(lines)
+        self.assertTrue(all(line.startswith("E1;") for line in lines))
+        self.assertTrue(any("move_to_floor" in line for line in lines))
+
+
+    @unittest.skipIf(sys.version_info >= (3, 12), "cProfile is interpreter-wide on Python 3.12+")
+    def test_cprofile_every_car_collapsed(self):
+        self.assert_every_car_collapsed(PhaseProfiler(cprofile=True, sampling=False))
+
+
+    def test_sampled_every_car_collapsed(self):
+        self.assert_every_car_collapsed(PhaseProfiler(cprofile=True, sampling=True))
+
+
+    def test_sampled_stacks_are_split_by_thread(self):
+        # ARRANGE
+        profiler = PhaseProfiler(cprofile=True, sampling=True)
+        elevators = [Elevator(name, starting_floor=1, profiler=profiler, clock=DilatedClock(200)) for name in ("E1", "E2")]
+
+        # ACT
+        self.serve_fleet(elevators, ElevatorRequest(1, 6))
+        stacks = profiler.get_collapsed_stacks()
+
+        # ASSERT
+        self.assertTrue(any(stack.startswith("E1;") and "move_to_floor" in stack for stack in stacks))
+        self.assertTrue(any(stack.startswith("E2;") and "move_to_floor" in stack for stack in stacks))
+        self.assertTrue(all(count > 0 for count in stacks.values()))
+
+
+    def test_dispatch_reported_apart_from_cars(self):
+        # ARRANGE
+        profiler = PhaseProfiler()
+        elevators = [Elevator("E1", 1), Elevator("E2", 9)]
+        dispatcher = Dispatcher(elevators, find_best_elevator, profiler=profiler)
+
+        # ACT
+        with patch('sys.stdout', new_callable=StringIO) as mock_out:
+            dispatcher.start()
+            dispatcher.submit(ElevatorRequest(1, 5))
+            dispatcher.submit(ElevatorRequest(9, 2))
+            dispatcher.stop()
+            dispatcher.join()
+            profiler.print_report()
+            output = mock_out.getvalue()
+        stats = profiler.get_phase_stats()
+
+        # ASSERT
+        self.assertEqual(['dispatcher'], list(stats))  # no car gets dispatcher time
+        self.assertEqual(2, stats['dispatcher']['dispatch']['count'])
+        self.assertIn("dispatcher :", output)
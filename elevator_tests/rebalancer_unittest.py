@@ -0,0 +1,136 @@
+import unittest
+from io import StringIO
+from unittest.mock import patch
+from elevator.Dispatcher import Dispatcher
+from elevator.Elevator import Elevator
+from elevator.ElevatorRequest import ElevatorRequest
+from elevator.Rebalancer import Rebalancer
+from elevator.StreamingSummary import StreamingSummary
+from elevator_simulation import get_fleet_snapshot
+
+
+class TestRebalancer(unittest.TestCase):
+
+    def test_estimate_queue(self):
+        # ARRANGE
+        elevator = Elevator("E1", starting_floor=1)
+        with patch('sys.stdout', new_callable=StringIO):
+            elevator.assign_request(ElevatorRequest(3, 5))
+            elevator.assign_request(ElevatorRequest(5, 1))
+
+        # ACT
+        pickups, completion, final_floor = Rebalancer.estimate_queue(elevator.snapshot())
+
+        # ASSERT
+        # 2 floors to pickup, load 2, 2 floors, unload 2, load 2, 4 floors, unload 2
+        self.assertEqual([2, 8], [eta for _, eta in pickups])
+        self.assertEqual(16, completion)
+        self.assertEqual(1, final_floor)
+
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_steals_from_overloaded_elevator(self, mock_stdout):
+        # ARRANGE
+        busy = Elevator("E1", starting_floor=1)
+        idle = Elevator("E2", starting_floor=10)
+        near_idle = ElevatorRequest(9, 2)
+        busy.assign_request(ElevatorRequest(1, 8))
+        busy.assign_request(ElevatorRequest(8, 1))
+        busy.assign_request(near_idle)
+        summary = StreamingSummary(["E1", "E2"])
+        for request in busy.requests:
+            summary.record("E1", request)
+        rebalancer = Rebalancer([busy, idle], summary=summary)
+
+        # ACT
+        moved = rebalancer.rebalance_once()
+
+        # ASSERT
+        self.assertGreaterEqual(moved, 1)
+        self.assertEqual(moved, rebalancer.moved)
+        self.assertEqual(moved, len(rebalancer.moves))
+        self.assertEqual(moved, summary.get_stats("E2")['requests'])  # summary updated at transfer time
+        self.assertEqual(3 - moved, summary.get_stats("E1")['requests'])
+        self.assertIn(near_idle, idle.requests)
+        self.assertNotIn(near_idle, busy.requests)
+        self.assertIn(near_idle, idle.snapshot().requests)
+        self.assertEqual((near_idle, "E1", "E2"), rebalancer.moves[0])
+
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_no_move_without_gain(self, mock_stdout):
+        # ARRANGE
+        e1 = Elevator("E1", starting_floor=1)
+        e2 = Elevator("E2", starting_floor=10)
+        e1.assign_request(ElevatorRequest(2, 4))
+        rebalancer = Rebalancer([e1, e2])
+
+        # ACT
+        moved = rebalancer.rebalance_once()
+
+        # ASSERT
+        self.assertEqual(0, moved)
+        self.assertEqual(1, len(e1.requests))
+
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_transfer_request_skips_picked_up(self, mock_stdout):
+        # ARRANGE
+        e1 = Elevator("E1")
+        e2 = Elevator("E2")
+        request = ElevatorRequest(2, 4)
+        e1.assign_request(request)
+        e1.take_next_request()  # the car picked it up first
+
+        # ACT
+        moved = e1.transfer_request(request, e2)
+
+        # ASSERT
+        self.assertFalse(moved)
+        self.assertEqual(0, len(e2.requests))
+
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_recent_moves_is_bounded(self, mock_stdout):
+        # ARRANGE
+        busy = Elevator("E1", starting_floor=1)
+        idle = Elevator("E2", starting_floor=10)
+        for _ in range(3):
+            busy.assign_request(ElevatorRequest(1, 10))
+        busy.assign_request(ElevatorRequest(10, 9))
+        busy.assign_request(ElevatorRequest(10, 8))
+        rebalancer = Rebalancer([busy, idle], recent_moves=1)
+
+        # ACT
+        moved = rebalancer.rebalance_once()
+
+        # ASSERT
+        self.assertGreaterEqual(moved, 2)
+        self.assertEqual(moved, rebalancer.moved)
+        self.assertEqual(1, len(rebalancer.moves))
+
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_ticket_locates_moved_request(self, mock_stdout):
+        # ARRANGE
+        busy = Elevator("E1", starting_floor=1)
+        idle = Elevator("E2", starting_floor=10)
+        near_idle = ElevatorRequest(10, 9)
+        dispatcher = Dispatcher([busy, idle], lambda request, elevators, fleet: busy)  # everything to E1
+        tickets = [dispatcher.submit(request) for request in
+                   (ElevatorRequest(1, 10), ElevatorRequest(2, 8), ElevatorRequest(3, 7), near_idle)]
+        dispatcher.start()
+        dispatcher.stop()
+        dispatcher.join()
+
+        # ACT
+        moved = Rebalancer([busy, idle]).rebalance_once()
+        fleet = get_fleet_snapshot([busy, idle])
+
+        # ASSERT
+        self.assertGreaterEqual(moved, 1)
+        self.assertEqual("E1", tickets[-1].elevator_name)  # the initial assignment is kept
+        self.assertEqual("E2", tickets[-1].locate(fleet))
+        self.assertEqual("E1", tickets[0].locate(fleet))
+        busy.take_next_request()
+        self.assertEqual("E1", tickets[0].locate(get_fleet_snapshot([busy, idle])))  # in progress
@@ -0,0 +1,142 @@
+import unittest
+from io import StringIO
+from unittest.mock import patch
+from elevator.Elevator import Elevator
+from elevator.ElevatorRequest import ElevatorRequest
+from elevator.HallCall import HallCall
+from elevator.OverflowPolicy import OverflowPolicy
+from elevator.RequestIngestor import RequestIngestor
+
+
+class TestRequestIngestor(unittest.TestCase):
+
+    def test_merges_same_floor_same_direction(self):
+        # ARRANGE
+        ingestor = RequestIngestor(window=5)
+
+        # ACT
+        results = [ingestor.submit(ElevatorRequest(1, 7), now=0),
+                   ingestor.submit(ElevatorRequest(1, 4), now=1),
+                   ingestor.submit(ElevatorRequest(1, 7), now=2),
+                   ingestor.submit(ElevatorRequest(5, 2), now=2)]
+        stops = ingestor.drain()
+
+        # ASSERT
+        self.assertEqual(['accepted', 'merged', 'merged', 'accepted'], results)
+        self.assertEqual(2, len(stops))
+        self.assertIsInstance(stops[0], HallCall)
+        self.assertEqual(3, len(stops[0].riders))
+        self.assertEqual((4, 7), stops[0].destination_floors)
+        self.assertEqual(7, stops[0].destination_floor)
+        self.assertEqual((2,), stops[1].destination_floors)  # single rider is passed through as-is
+        self.assertFalse(ingestor.has_pending())
+
+
+    def test_does_not_merge_outside_window_or_other_direction(self):
+        # ARRANGE
+        ingestor = RequestIngestor(window=5)
+
+        # ACT
+        ingestor.submit(ElevatorRequest(3, 8), now=0)
+        ingestor.submit(ElevatorRequest(3, 1), now=1)
+        ingestor.submit(ElevatorRequest(3, 9), now=10)
+        ingestor.submit(ElevatorRequest(3, 3), now=10)
+
+        # ASSERT
+        self.assertEqual(3, len(ingestor.drain()))
+        self.assertEqual(0, ingestor.merged)
+
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_shed_when_full(self, mock_stdout):
+        # ARRANGE
+        ingestor = RequestIngestor(max_pending=2, overflow_policy=OverflowPolicy.SHED)
+
+        # ACT
+        results = [ingestor.submit(ElevatorRequest(floor, 10), now=0) for floor in (1, 2, 3)]
+        merged = ingestor.submit(ElevatorRequest(1, 9), now=0)
+
+        # ASSERT
+        self.assertEqual(['accepted', 'accepted', 'shed'], results)
+        self.assertEqual('merged', merged)  # merging never needs a new slot
+        self.assertEqual(2, len(ingestor.drain()))
+        self.assertFalse(ingestor.has_pending())
+        self.assertIn("Request shed", mock_stdout.getvalue())
+
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_defer_when_full(self, mock_stdout):
+        # ARRANGE
+        ingestor = RequestIngestor(max_pending=1, overflow_policy=OverflowPolicy.DEFER)
+
+        # ACT
+        ingestor.submit(ElevatorRequest(1, 5), now=0)
+        result = ingestor.submit(ElevatorRequest(2, 5), now=0)
+        first_burst = ingestor.drain(now=1)
+        second_burst = ingestor.drain(now=2)
+
+        # ASSERT
+        self.assertEqual('deferred', result)
+        self.assertEqual(1, first_burst[0].start_floor)
+        self.assertEqual(2, second_burst[0].start_floor)
+        self.assertFalse(ingestor.has_pending())
+
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_deferred_backlog_is_bounded(self, mock_stdout):
+        # ARRANGE
+        ingestor = RequestIngestor(max_pending=1, max_deferred=1, overflow_policy=OverflowPolicy.DEFER)
+
+        # ACT
+        results = [ingestor.submit(ElevatorRequest(floor, 10), now=0) for floor in (1, 2, 3)]
+
+        # ASSERT
+        self.assertEqual(['accepted', 'deferred', 'shed'], results)
+        self.assertEqual(1, len(ingestor.drain(now=0)))
+        self.assertTrue(ingestor.has_pending())  # the deferred stop waits for the next drain
+
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_joins_assigned_stop_within_window(self, mock_stdout):
+        # ARRANGE
+        ingestor = RequestIngestor(window=5)
+        elevator = Elevator("E1")
+        ingestor.submit(ElevatorRequest(1, 5), now=0)
+        stop = ingestor.drain(now=0)[0]
+        elevator.assign_request(stop)
+        ingestor.assign(stop, elevator)
+
+        # ACT
+        joined = ingestor.submit(ElevatorRequest(1, 7), now=3)
+        late = ingestor.submit(ElevatorRequest(1, 6), now=9)
+
+        # ASSERT
+        self.assertEqual('joined', joined)
+        self.assertIs(elevator, ingestor.get_assignment(ElevatorRequest(1, 9)))
+        self.assertEqual((5, 7), elevator.requests[0].destination_floors)
+        self.assertEqual('accepted', late)  # window closed: a new stop
+        self.assertEqual(1, ingestor.merged)
+
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_does_not_join_picked_up_stop(self, mock_stdout):
+        # ARRANGE
+        ingestor = RequestIngestor(window=5)
+        elevator = Elevator("E1")
+        ingestor.submit(ElevatorRequest(1, 5), now=0)
+        stop = ingestor.drain(now=0)[0]
+        elevator.assign_request(stop)
+        ingestor.assign(stop, elevator)
+        elevator.take_next_request()
+
+        # ACT
+        result = ingestor.submit(ElevatorRequest(1, 7), now=1)
+
+        # ASSERT
+        self.assertEqual('accepted', result)
+        self.assertEqual(0, ingestor.merged)
+
+
+    def test_invalid_max_pending(self):
+        with self.assertRaises(ValueError):
+            RequestIngestor(max_pending=0)
@@ -0,0 +1,95 @@
+import csv
+import gzip
+import os
+import tempfile
+import unittest
+from io import StringIO
+from unittest.mock import patch
+from elevator.ElevatorRequest import ElevatorRequest
+from elevator.HallCall import HallCall
+from elevator.StreamingSummary import StreamingSummary
+
+
+class TestStreamingSummary(unittest.TestCase):
+
+    def test_record_aggregates(self):
+        # ARRANGE
+        summary = StreamingSummary(["E1", "E2"])
+        hall_call = HallCall(ElevatorRequest(1, 5))
+        hall_call.add_rider(ElevatorRequest(1, 3))
+
+        # ACT
+        for _ in range(1000):
+            summary.record("E1", ElevatorRequest(1, 5))
+        summary.record("E2", hall_call)
+        e1 = summary.get_stats("E1")
+        e2 = summary.get_stats("E2")
+
+        # ASSERT
+        self.assertEqual(1000, e1['requests'])
+        self.assertEqual(4000, e1['requested_floors'])
+        self.assertEqual({(1, 5): 1000}, dict(e1['routes']))  # one heatmap cell, however long the run
+        self.assertEqual(1, e2['requests'])
+        self.assertEqual(2, e2['riders'])
+        self.assertEqual(6, e2['requested_floors'])
+
+
+    def test_move(self):
+        # ARRANGE
+        summary = StreamingSummary(["E1", "E2"])
+        request = ElevatorRequest(9, 2)
+        summary.record("E1", request)
+
+        # ACT
+        summary.move(request, "E1", "E2")
+
+        # ASSERT
+        self.assertEqual(0, summary.get_stats("E1")['requests'])
+        self.assertEqual(0, len(summary.get_stats("E1")['routes']))
+        self.assertEqual(1, summary.get_stats("E2")['requests'])
+
+
+    def test_report_size_is_constant(self):
+        # ARRANGE
+        short_run = StreamingSummary(["E1"])
+        long_run = StreamingSummary(["E1"])
+        short_run.record("E1", ElevatorRequest(1, 5))
+        for floor in range(2, 5000):
+            long_run.record("E1", ElevatorRequest(1, floor))
+
+        # ACT
+        with patch('sys.stdout', new_callable=StringIO) as mock_out:
+            short_run.print_report()
+            short_lines = len(mock_out.getvalue().splitlines())
+        with patch('sys.stdout', new_callable=StringIO) as mock_out:
+            long_run.print_report()
+            long_lines = len(mock_out.getvalue().splitlines())
+
+        # ASSERT
+        self.assertEqual(short_lines, long_lines)
+
+
+    def test_spill_to_gzip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # ARRANGE
+            filepath = os.path.join(directory, "assignments.csv.gz")
+            summary = StreamingSummary(["E1", "E2"], spill_path=filepath)
+            request = ElevatorRequest(2, 6)
+            hall_call = HallCall(ElevatorRequest(1, 9))
+            hall_call.add_rider(ElevatorRequest(1, 4))
+
+            # ACT
+            summary.record("E1", request)
+            summary.move(request, "E1", "E2")
+            summary.record("E2", hall_call)
+            summary.close()
+            with gzip.open(filepath, 'rt', newline='') as file:
+                rows = list(csv.reader(file))
+
+        # ASSERT
+        self.assertEqual(list(StreamingSummary.SPILL_HEADER), rows[0])
+        self.assertEqual(['assign', 'E1', '', '2', '6'], rows[1])
+        self.assertEqual(['move', 'E2', 'E1', '2', '6'], rows[2])
+        # one row per rider of a coalesced stop
+        self.assertEqual(['assign', 'E2', '', '1', '9'], rows[3])
+        self.assertEqual(['assign', 'E2', '', '1', '4'], rows[4])